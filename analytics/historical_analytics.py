@@ -1,50 +1,202 @@
 # Historical Analytics Module for Market Sentinel
 
+import logging
+import os
 import duckdb
+import numpy as np
 import pandas as pd
-from typing import Optional
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-def load_price_data(csv_file_path: str, table_name: Optional[str] = None) -> pd.DataFrame:
+from utils.jit import njit, prange
+
+logger = logging.getLogger(__name__)
+
+# Shared in-memory DuckDB database. Each call works on its own cursor, since a
+# single connection must not be used from several threads at once.
+_CON = duckdb.connect(database=':memory:')
+
+# Accepted for date filters: ISO date strings, datetime.date and pandas Timestamps
+DateLike = Union[str, date, pd.Timestamp]
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+# Rows per Parquet row group. Each group carries min/max statistics, so with rows
+# sorted by (symbol, date) a ticker or date-range filter skips most groups.
+_PARQUET_ROW_GROUP_SIZE = 100_000
+
+def convert_prices_to_parquet(csv_path: str, out_path: str) -> str:
     """
-    Load price data from a CSV file using DuckDB and return as pandas DataFrame.
+    Convert a price CSV to Parquet laid out for filtered scans.
+
+    Rows are sorted by (symbol, date) when both columns exist and written in row
+    groups of _PARQUET_ROW_GROUP_SIZE rows; DuckDB dictionary-encodes low-cardinality
+    string columns such as symbol on its own. Filters on symbol and date can then
+    be answered from the row group statistics without reading the other groups.
 
     Args:
-        csv_file_path (str): Path to the CSV file containing price data
-        table_name (Optional[str]): Optional table name for the data (defaults to filename)
+        csv_path (str): Path to the source CSV file
+        out_path (str): Path of the Parquet file to write (overwritten if present)
 
     Returns:
-        pd.DataFrame: DataFrame containing the loaded price data
+        str: out_path
+    """
+    cursor = _CON.cursor()
+    try:
+        # The relation API passes both paths as values rather than spliced SQL text
+        relation = cursor.read_csv(csv_path)
+        if 'symbol' in relation.columns and 'date' in relation.columns:
+            relation = relation.order('symbol, date')
+        relation.write_parquet(out_path, row_group_size=_PARQUET_ROW_GROUP_SIZE)
+    finally:
+        cursor.close()
+    return out_path
+
+def _ensure_parquet_cache(csv_file_path: str) -> Optional[str]:
+    """
+    Write a Parquet copy of a CSV file next to it, refreshing it when the CSV is newer.
+
+    Args:
+        csv_file_path (str): Path to the source CSV file
+
+    Returns:
+        Optional[str]: Path to the Parquet cache, or None if it could not be written
+            (e.g. read-only data directory), in which case the CSV should be read directly
 
     Raises:
         FileNotFoundError: If the CSV file doesn't exist
-        Exception: For other loading errors
     """
     try:
-        # Create DuckDB connection
-        con = duckdb.connect(database=':memory:')
-
-        # If no table name provided, use filename without extension
-        if table_name is None:
-            import os
-            table_name = os.path.splitext(os.path.basename(csv_file_path))[0]
-
-        # Load CSV into DuckDB
-        query = f"""
-        CREATE TABLE {table_name} AS
-        SELECT * FROM read_csv_auto('{csv_file_path}')
-        """
+        csv_mtime = os.path.getmtime(csv_file_path)
+    except OSError:
+        raise FileNotFoundError(f"CSV file not found: {csv_file_path}")
 
-        con.execute(query)
+    parquet_path = os.path.splitext(csv_file_path)[0] + '.parquet'
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= csv_mtime:
+        return parquet_path
 
-        # Convert to pandas DataFrame
-        df = con.execute(f"SELECT * FROM {table_name}").fetchdf()
+    # Write to a temporary file first so readers never see a partial cache
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    try:
+        convert_prices_to_parquet(csv_file_path, tmp_path)
+        os.replace(tmp_path, parquet_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+
+    return parquet_path
+
+def _price_filter(symbols: Optional[Sequence[str]], start: Optional[DateLike],
+                  end: Optional[DateLike]) -> Optional[duckdb.Expression]:
+    """
+    Filter expression for a symbol set and an inclusive date range.
 
-        # Close connection
-        con.close()
+    The values are bound as constants of the expression, never spliced into SQL
+    text, so a symbol like "AAPL' OR '1'='1" only ever matches itself.
+    """
+    conditions = []
+    if symbols is not None:
+        symbols = list(symbols)
+        if not symbols:
+            return duckdb.ConstantExpression(False)
+        conditions.append(duckdb.ColumnExpression('symbol').isin(*map(duckdb.ConstantExpression, symbols)))
+    if start is not None:
+        conditions.append(duckdb.ColumnExpression('date') >= duckdb.ConstantExpression(pd.Timestamp(start).date()))
+    if end is not None:
+        conditions.append(duckdb.ColumnExpression('date') <= duckdb.ConstantExpression(pd.Timestamp(end).date()))
+    if not conditions:
+        return None
+
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+def _scan_prices(cursor: duckdb.DuckDBPyConnection, csv_file_path: str, columns: Optional[List[str]],
+                 symbols: Optional[Sequence[str]], start: Optional[DateLike],
+                 end: Optional[DateLike]) -> duckdb.DuckDBPyRelation:
+    """Relation over the price data on a given cursor; see load_price_relation."""
+    parquet_path = _ensure_parquet_cache(csv_file_path)
+    relation = cursor.read_parquet(parquet_path) if parquet_path is not None else cursor.read_csv(csv_file_path)
+
+    # Filter before projecting so the filter may reference any column
+    condition = _price_filter(symbols, start, end)
+    if condition is not None:
+        relation = relation.filter(condition)
+    if columns:
+        relation = relation.project(", ".join(_quote_identifier(col) for col in columns))
+    return relation
+
+def load_price_relation(csv_file_path: str, columns: Optional[List[str]] = None,
+                        symbols: Optional[Sequence[str]] = None, start: Optional[DateLike] = None,
+                        end: Optional[DateLike] = None) -> duckdb.DuckDBPyRelation:
+    """
+    Lazily query price data through its Parquet cache without materializing it.
 
-        print(f"Successfully loaded {len(df)} rows from {csv_file_path} using DuckDB")
+    Nothing is read until the relation is executed (e.g. with .df() or .fetchall()),
+    and DuckDB pushes the projection and filter down into the Parquet scan.
+
+    The relation runs on a cursor of the shared connection that belongs to it:
+    the cursor is not closed here, since that would invalidate the relation, and
+    is released together with the relation once it is no longer referenced.
+
+    Args:
+        csv_file_path (str): Path to the CSV file containing price data
+        columns (Optional[List[str]]): Columns to project (defaults to all columns)
+        symbols (Optional[Sequence[str]]): Only rows for these symbols (defaults to all)
+        start (Optional[DateLike]): Only rows dated on or after this date, e.g. '2024-01-10'
+        end (Optional[DateLike]): Only rows dated on or before this date
+
+    Returns:
+        duckdb.DuckDBPyRelation: Relation over the requested rows and columns
+
+    Raises:
+        FileNotFoundError: If the CSV file doesn't exist
+    """
+    return _scan_prices(_CON.cursor(), csv_file_path, columns, symbols, start, end)
+
+def load_price_data(csv_file_path: str, table_name: Optional[str] = None,
+                    columns: Optional[List[str]] = None, symbols: Optional[Sequence[str]] = None,
+                    start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> pd.DataFrame:
+    """
+    Load price data from a CSV file using DuckDB and return as pandas DataFrame.
+
+    The CSV is converted to a sibling Parquet file on first load (and whenever the
+    CSV changes); later loads scan the Parquet copy and only read the requested
+    columns and rows.
+
+    Args:
+        csv_file_path (str): Path to the CSV file containing price data
+        table_name (Optional[str]): Deprecated and ignored; data is no longer
+            materialized into an intermediate table
+        columns (Optional[List[str]]): Columns to load (defaults to all columns)
+        symbols (Optional[Sequence[str]]): Only rows for these symbols (defaults to all)
+        start (Optional[DateLike]): Only rows dated on or after this date, e.g. '2024-01-10'
+        end (Optional[DateLike]): Only rows dated on or before this date
+
+    Returns:
+        pd.DataFrame: DataFrame containing the loaded price data
+
+    Raises:
+        FileNotFoundError: If the CSV file doesn't exist
+        Exception: For other loading errors
+    """
+    try:
+        # Go through Arrow so pandas can take over DuckDB's column buffers;
+        # self_destruct frees each Arrow column as soon as it is converted
+        with _CON.cursor() as cursor:
+            table = _scan_prices(cursor, csv_file_path, columns, symbols, start, end).to_arrow_table()
+        df = table.to_pandas(self_destruct=True, date_as_object=False)
+        del table
+
+        logger.debug("Successfully loaded %d rows from %s using DuckDB", len(df), csv_file_path)
         return df
 
+    except FileNotFoundError:
+        raise
     except Exception as e:
         error_msg = str(e)
         if "No files found" in error_msg or "file does not exist" in error_msg.lower():
@@ -75,28 +227,134 @@ def get_price_summary(df: pd.DataFrame) -> dict:
         # Add numeric column statistics
         numeric_cols = df.select_dtypes(include=['number']).columns
         if len(numeric_cols) > 0:
-            summary['numeric_stats'] = {}
-            for col in numeric_cols:
-                summary['numeric_stats'][col] = {
-                    'mean': df[col].mean(),
-                    'min': df[col].min(),
-                    'max': df[col].max(),
-                    'std': df[col].std()
-                }
+            # One aggregation pass over the numeric block instead of four per column
+            stats = df[numeric_cols].agg(['mean', 'min', 'max', 'std']).to_dict()
+            summary['numeric_stats'] = {
+                col: {stat: stats[col][stat] for stat in ('mean', 'min', 'max', 'std')}
+                for col in numeric_cols
+            }
 
         return summary
 
     except Exception as e:
         return {'error': f'Failed to generate summary: {str(e)}'}
 
-def compute_event_reaction(price_df: pd.DataFrame, ticker: str, event_date: str, days_before: int = 30, days_after: int = 30) -> dict:
+@dataclass
+class PriceStore:
+    """
+    Close prices sorted by (symbol, date) with a per-symbol index.
+
+    Build it once with PriceStore.from_frame and pass it to compute_event_reaction
+    or compute_event_reactions_batch in place of the DataFrame, so each event costs
+    O(log N) searchsorted lookups instead of a filter and sort over all prices.
+
+    Attributes:
+        dates (np.ndarray): datetime64[ns] dates, ascending within each symbol
+        closes (np.ndarray): float64 close prices aligned with dates
+        returns (np.ndarray): Daily returns over each symbol's full series, NaN on its first day
+        segments (Dict[str, Tuple[int, int]]): Upper-cased symbol -> [start, end) range in the arrays
+    """
+    dates: np.ndarray
+    closes: np.ndarray
+    returns: np.ndarray
+    segments: Dict[str, Tuple[int, int]]
+
+    @classmethod
+    def from_frame(cls, price_df: pd.DataFrame) -> 'PriceStore':
+        """
+        Build a store from a DataFrame with date, symbol and close columns.
+
+        Args:
+            price_df (pd.DataFrame): DataFrame containing price data with columns: date, symbol, close (and others)
+
+        Returns:
+            PriceStore: Sorted price arrays and symbol index
+        """
+        con = _CON.cursor()
+        try:
+            con.register('prices', price_df)
+            return cls._from_relation(con.table('prices'))
+        finally:
+            con.close()
+
+    @classmethod
+    def from_csv(cls, csv_file_path: str, symbols: Optional[Sequence[str]] = None,
+                 start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> 'PriceStore':
+        """
+        Build a store straight from a price CSV through its Parquet cache.
+
+        Only the date, symbol and close columns are read, and symbol and date
+        filters are pushed down into the scan.
+
+        Args:
+            csv_file_path (str): Path to the CSV file containing price data
+            symbols (Optional[Sequence[str]]): Only these symbols (defaults to all)
+            start (Optional[DateLike]): Only prices dated on or after this date
+            end (Optional[DateLike]): Only prices dated on or before this date
+
+        Returns:
+            PriceStore: Sorted price arrays and symbol index
+
+        Raises:
+            FileNotFoundError: If the CSV file doesn't exist
+        """
+        with _CON.cursor() as cursor:
+            relation = _scan_prices(cursor, csv_file_path, ['date', 'symbol', 'close'], symbols, start, end)
+            return cls._from_relation(relation)
+
+    @classmethod
+    def _from_relation(cls, relation: duckdb.DuckDBPyRelation) -> 'PriceStore':
+        prices = relation.project(
+            "upper(symbol) AS symbol, CAST(date AS TIMESTAMP) AS date, close"
+        ).order("symbol, date").fetchnumpy()
+
+        symbols = prices['symbol']
+        dates = prices['date'].astype('datetime64[ns]')
+        closes = prices['close'].astype(np.float64)
+
+        # Contiguous [start, end) range of each symbol in the sorted arrays
+        segments = {}
+        returns = np.empty_like(closes)
+        if len(symbols) > 0:
+            boundaries = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(symbols)]))
+            segments = {symbols[s]: (int(s), int(e)) for s, e in zip(starts, ends)}
+
+            # Returns are computed across the whole series, then reset at each
+            # symbol's first row so they never span two symbols
+            returns[1:] = closes[1:] / closes[:-1] - 1
+            returns[starts] = np.nan
+
+        return cls(dates=dates, closes=closes, returns=returns, segments=segments)
+
+    def ticker_range(self, ticker: str) -> Tuple[int, int]:
+        """[start, end) range of a ticker in the sorted arrays, (0, 0) if unknown."""
+        return self.segments.get(ticker.upper(), (0, 0))
+
+def _as_price_store(prices: Union[pd.DataFrame, PriceStore]) -> PriceStore:
+    return prices if isinstance(prices, PriceStore) else PriceStore.from_frame(prices)
+
+def _to_datetime64(value: Union[str, np.datetime64]) -> np.datetime64:
+    """Convert an event date to datetime64[ns], parsing ISO strings without pandas."""
+    try:
+        return np.datetime64(value, 'ns')
+    except ValueError:
+        # Non-ISO formats such as '01/17/2024'
+        return pd.Timestamp(value).to_datetime64()
+
+def _format_date(value: np.datetime64) -> str:
+    return np.datetime_as_string(value, unit='D')
+
+def compute_event_reaction(price_df: Union[pd.DataFrame, PriceStore], ticker: str, event_date: Union[str, np.datetime64], days_before: int = 30, days_after: int = 30) -> dict:
     """
     Compute event reaction metrics including returns and volatility for a given ticker and event date.
 
     Args:
-        price_df (pd.DataFrame): DataFrame containing price data with columns: date, symbol, close (and others)
+        price_df (Union[pd.DataFrame, PriceStore]): DataFrame containing price data with columns: date, symbol,
+            close (and others), or a PriceStore built from one. Pass a PriceStore when analyzing many events.
         ticker (str): Stock ticker symbol (e.g., 'AAPL')
-        event_date (str): Event date in 'YYYY-MM-DD' format
+        event_date (Union[str, np.datetime64]): Event date in 'YYYY-MM-DD' format or as a datetime64
         days_before (int): Number of days before event to include in analysis
         days_after (int): Number of days after event to include in analysis
 
@@ -105,75 +363,69 @@ def compute_event_reaction(price_df: pd.DataFrame, ticker: str, event_date: str,
     """
     try:
         # Convert event_date to datetime
-        event_dt = pd.to_datetime(event_date)
-
-        # Filter data for the specific ticker
-        ticker_data = price_df[price_df['symbol'].str.upper() == ticker.upper()].copy()
-
-        if len(ticker_data) == 0:
-            return {'error': f'No data found for ticker: {ticker}'}
-
-        # Ensure date column is datetime
-        ticker_data['date'] = pd.to_datetime(ticker_data['date'])
-
-        # Sort by date
-        ticker_data = ticker_data.sort_values('date')
+        event_dt = _to_datetime64(event_date)
 
         # Define analysis window
-        start_date = event_dt - pd.Timedelta(days=days_before)
-        end_date = event_dt + pd.Timedelta(days=days_after)
+        start_date = event_dt - np.timedelta64(days_before, 'D')
+        end_date = event_dt + np.timedelta64(days_after, 'D')
 
-        # Filter data within the analysis window
-        window_data = ticker_data[
-            (ticker_data['date'] >= start_date) &
-            (ticker_data['date'] <= end_date)
-        ].copy()
+        store = _as_price_store(price_df)
+        start, end = store.ticker_range(ticker)
+        if start == end:
+            return {'error': f'No data found for ticker: {ticker}'}
 
-        if len(window_data) < 2:
-            return {'error': f'Insufficient data for analysis. Need at least 2 data points, got {len(window_data)}'}
+        # Slice the analysis window out of the ticker's sorted dates
+        ticker_dates = store.dates[start:end]
+        lo = int(np.searchsorted(ticker_dates, start_date, side='left'))
+        hi = int(np.searchsorted(ticker_dates, end_date, side='right'))
+        window_dates = ticker_dates[lo:hi]
+        window_closes = store.closes[start + lo:start + hi]
+        # Returns come from the full series, so the window's first day still
+        # has a return against the previous trading day
+        daily_returns = store.returns[start + lo:start + hi]
 
-        # Calculate daily returns
-        window_data['daily_return'] = window_data['close'].pct_change()
+        if len(window_dates) < 2:
+            return {'error': f'Insufficient data for analysis. Need at least 2 data points, got {len(window_dates)}'}
 
         # Find event date in the data (or closest trading day)
-        event_mask = window_data['date'] >= event_dt
-        if event_mask.any():
-            event_idx = event_mask.idxmax()
-            event_row = window_data.loc[event_idx]
-        else:
+        event_pos = int(np.searchsorted(window_dates, event_dt, side='left'))
+        if event_pos == len(window_dates):
             return {'error': f'Event date {event_date} not found in data range'}
 
-        # Get event date index
-        event_date_in_data = event_row['date']
+        event_date_in_data = window_dates[event_pos]
+        event_price = window_closes[event_pos]
 
         # Calculate returns from event date
         results = {
             'ticker': ticker,
             'event_date': event_date,
-            'event_date_found': event_date_in_data.strftime('%Y-%m-%d'),
-            'event_price': event_row['close']
+            'event_date_found': _format_date(event_date_in_data),
+            'event_price': event_price
         }
 
         # Calculate N-day returns (1, 3, 5 days after event)
         for days in [1, 3, 5]:
             try:
-                future_date = event_date_in_data + pd.Timedelta(days=days)
+                future_date = event_date_in_data + np.timedelta64(days, 'D')
 
-                # Find the closest trading day within a reasonable range
-                future_mask = (window_data['date'] >= future_date - pd.Timedelta(days=2)) & \
-                             (window_data['date'] <= future_date + pd.Timedelta(days=2))
+                # Find the closest trading day within a reasonable range:
+                # the first date on or after future_date - 2 days, if it is
+                # no later than future_date + 2 days
+                future_pos = int(np.searchsorted(
+                    window_dates, future_date - np.timedelta64(2, 'D'), side='left'
+                ))
 
-                if future_mask.any():
-                    future_row = window_data[future_mask].iloc[0]  # Take the first match
-                    future_price = future_row['close']
-                    n_day_return = (future_price - event_row['close']) / event_row['close']
+                if future_pos < len(window_dates) and \
+                        window_dates[future_pos] <= future_date + np.timedelta64(2, 'D'):
+                    future_price = window_closes[future_pos]
+                    n_day_return = (future_price - event_price) / event_price
 
                     results[f'{days}_day_return'] = n_day_return
                     results[f'{days}_day_price'] = future_price
-                    results[f'{days}_day_date'] = future_row['date'].strftime('%Y-%m-%d')
+                    results[f'{days}_day_date'] = _format_date(window_dates[future_pos])
                 else:
                     results[f'{days}_day_return'] = None
-                    results[f'{days}_day_note'] = f'No trading data found around {future_date.strftime("%Y-%m-%d")}'
+                    results[f'{days}_day_note'] = f'No trading data found around {_format_date(future_date)}'
 
             except Exception as e:
                 results[f'{days}_day_return'] = None
@@ -183,26 +435,27 @@ def compute_event_reaction(price_df: pd.DataFrame, ticker: str, event_date: str,
         # Use data from 20 trading days before to 20 trading days after event
         try:
             # Get data around event date (±20 trading days)
-            vol_start_idx = max(0, event_idx - 20)
-            vol_end_idx = min(len(window_data), event_idx + 21)  # +21 to include event day
-
-            vol_data = window_data.iloc[vol_start_idx:vol_end_idx]
+            vol_start_idx = max(0, event_pos - 20)
+            vol_end_idx = min(len(window_dates), event_pos + 21)  # +21 to include event day
+            sample_size = vol_end_idx - vol_start_idx
 
-            if len(vol_data) >= 10:  # Need reasonable amount of data
+            if sample_size >= 10:  # Need reasonable amount of data
                 # Calculate volatility (annualized by multiplying by sqrt(252))
-                daily_volatility = vol_data['daily_return'].std()
-                annualized_volatility = daily_volatility * (252 ** 0.5)  # 252 trading days in a year
+                # Only a ticker's first day has a NaN return, so at least 9 remain
+                daily_volatility = float(np.nanstd(daily_returns[vol_start_idx:vol_end_idx], ddof=1))
+                annualized_volatility = daily_volatility * np.sqrt(252.0)  # 252 trading days in a year
 
+                # Dates are sorted, so the period bounds are the slice ends
                 results['volatility_20_day'] = {
                     'daily_volatility': daily_volatility,
                     'annualized_volatility': annualized_volatility,
-                    'sample_size': len(vol_data),
-                    'period_start': vol_data['date'].min().strftime('%Y-%m-%d'),
-                    'period_end': vol_data['date'].max().strftime('%Y-%m-%d')
+                    'sample_size': sample_size,
+                    'period_start': _format_date(window_dates[vol_start_idx]),
+                    'period_end': _format_date(window_dates[vol_end_idx - 1])
                 }
             else:
                 results['volatility_20_day'] = {
-                    'error': f'Insufficient data for volatility calculation. Need at least 10 data points, got {len(vol_data)}'
+                    'error': f'Insufficient data for volatility calculation. Need at least 10 data points, got {sample_size}'
                 }
 
         except Exception as e:
@@ -212,3 +465,189 @@ def compute_event_reaction(price_df: pd.DataFrame, ticker: str, event_date: str,
 
     except Exception as e:
         return {'error': f'Failed to compute event reaction: {str(e)}'}
+
+_NS_PER_DAY = 86_400 * 10**9
+_REACTION_HORIZONS = np.array([1, 3, 5], dtype=np.int64)
+
+# Status codes set by _event_reaction_kernel
+_STATUS_OK = 0
+_STATUS_NO_TICKER = 1
+_STATUS_INSUFFICIENT = 2
+_STATUS_NOT_FOUND = 3
+_STATUS_INVALID_DATE = 4
+
+@njit(cache=True)
+def _lower_bound(values, lo, hi, target):
+    """First index in values[lo:hi] whose value is >= target (hi if none)."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if values[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+@njit(cache=True)
+def _upper_bound(values, lo, hi, target):
+    """First index in values[lo:hi] whose value is > target (hi if none)."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if values[mid] <= target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+@njit(parallel=True, cache=True)
+def _event_reaction_kernel(dates, returns, seg_start, seg_end, event_dates, status,
+                           days_before, days_after, horizons):
+    """
+    Per-event window lookups and volatility over (symbol, date)-sorted price arrays.
+
+    dates are int64 nanoseconds and returns are PriceStore.returns; seg_start/seg_end
+    delimit each event's ticker in the sorted arrays, and status is updated in place
+    with a _STATUS_* code.
+    Mirrors compute_event_reaction, one event per prange iteration, with the
+    volatility computed by Welford's online algorithm.
+    """
+    n_events = len(event_dates)
+    window_size = np.zeros(n_events, dtype=np.int64)
+    event_idx = np.full(n_events, -1, dtype=np.int64)
+    future_idx = np.full((n_events, len(horizons)), -1, dtype=np.int64)
+    vol_size = np.zeros(n_events, dtype=np.int64)
+    daily_vol = np.full(n_events, np.nan)
+
+    for i in prange(n_events):
+        if status[i] != _STATUS_OK:
+            continue
+        start = seg_start[i]
+        end = seg_end[i]
+        if start == end:
+            status[i] = _STATUS_NO_TICKER
+            continue
+
+        event_dt = event_dates[i]
+        lo = _lower_bound(dates, start, end, event_dt - days_before * _NS_PER_DAY)
+        hi = _upper_bound(dates, start, end, event_dt + days_after * _NS_PER_DAY)
+        window_size[i] = hi - lo
+        if hi - lo < 2:
+            status[i] = _STATUS_INSUFFICIENT
+            continue
+
+        pos = _lower_bound(dates, lo, hi, event_dt)
+        if pos == hi:
+            status[i] = _STATUS_NOT_FOUND
+            continue
+        event_idx[i] = pos
+
+        # First trading day on or after future - 2 days, if no later than future + 2 days
+        for k in range(len(horizons)):
+            future = dates[pos] + horizons[k] * _NS_PER_DAY
+            future_pos = _lower_bound(dates, lo, hi, future - 2 * _NS_PER_DAY)
+            if future_pos < hi and dates[future_pos] <= future + 2 * _NS_PER_DAY:
+                future_idx[i, k] = future_pos
+
+        # ±20 trading days around the event; NaN marks the ticker's first day
+        v_lo = max(lo, pos - 20)
+        v_hi = min(hi, pos + 21)
+        vol_size[i] = v_hi - v_lo
+        if v_hi - v_lo >= 10:
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+            for j in range(v_lo, v_hi):
+                daily_return = returns[j]
+                if np.isnan(daily_return):
+                    continue
+                count += 1
+                delta = daily_return - mean
+                mean += delta / count
+                m2 += delta * (daily_return - mean)
+            if count > 1:
+                daily_vol[i] = np.sqrt(m2 / (count - 1))
+
+    return window_size, event_idx, future_idx, vol_size, daily_vol
+
+def compute_event_reactions_batch(price_df: Union[pd.DataFrame, PriceStore], events: List[Tuple[str, str]],
+                                  days_before: int = 30, days_after: int = 30) -> pd.DataFrame:
+    """
+    Compute event reaction metrics for many (ticker, event_date) pairs at once.
+
+    Prices are sorted by (symbol, date) once, then all events are processed by a
+    single kernel which runs in parallel when numba is installed.
+
+    Args:
+        price_df (Union[pd.DataFrame, PriceStore]): DataFrame containing price data with columns: date, symbol,
+            close (and others), or a PriceStore built from one
+        events (List[Tuple[str, str]]): (ticker, event_date) pairs, dates in 'YYYY-MM-DD' format
+        days_before (int): Number of days before event to include in analysis
+        days_after (int): Number of days after event to include in analysis
+
+    Returns:
+        pd.DataFrame: One row per event in input order, with the same return and
+            volatility fields as compute_event_reaction (volatility flattened into
+            daily_volatility, annualized_volatility and volatility_sample_size)
+            and an 'error' column that is None for successful rows
+    """
+    store = _as_price_store(price_df)
+    dates = store.dates.view(np.int64)
+    closes = store.closes
+
+    tickers = [ticker for ticker, _ in events]
+    event_dates_raw = [event_date for _, event_date in events]
+    seg_start = np.array([store.ticker_range(t)[0] for t in tickers], dtype=np.int64)
+    seg_end = np.array([store.ticker_range(t)[1] for t in tickers], dtype=np.int64)
+
+    parsed_dates = pd.to_datetime(pd.Series(event_dates_raw, dtype=object), errors='coerce')
+    invalid = parsed_dates.isna().to_numpy()
+    event_dates = parsed_dates.to_numpy(dtype='datetime64[ns]').view(np.int64).copy()
+    event_dates[invalid] = 0
+    status = np.where(invalid, _STATUS_INVALID_DATE, _STATUS_OK).astype(np.int64)
+
+    window_size, event_idx, future_idx, vol_size, daily_vol = _event_reaction_kernel(
+        dates, store.returns, seg_start, seg_end, event_dates, status,
+        days_before, days_after, _REACTION_HORIZONS
+    )
+
+    def format_dates(idx):
+        """'YYYY-MM-DD' strings for positions in the sorted arrays, None where idx is -1."""
+        valid = idx >= 0
+        formatted = np.full(len(idx), None, dtype=object)
+        formatted[valid] = pd.to_datetime(dates[idx[valid]]).strftime('%Y-%m-%d')
+        return pd.Series(formatted, dtype=object)
+
+    # Position -1 (no match) picks up the trailing NaN
+    padded_closes = np.append(closes, np.nan)
+    event_price = padded_closes[event_idx]
+    result = pd.DataFrame({
+        'ticker': tickers,
+        'event_date': event_dates_raw,
+        'event_date_found': format_dates(event_idx),
+        'event_price': event_price,
+    })
+
+    for k, days in enumerate(_REACTION_HORIZONS):
+        future_price = padded_closes[future_idx[:, k]]
+        result[f'{days}_day_return'] = (future_price - event_price) / event_price
+        result[f'{days}_day_price'] = future_price
+        result[f'{days}_day_date'] = format_dates(future_idx[:, k])
+
+    result['daily_volatility'] = daily_vol
+    result['annualized_volatility'] = daily_vol * (252 ** 0.5)
+    result['volatility_sample_size'] = vol_size
+
+    errors = []
+    for i, code in enumerate(status):
+        if code == _STATUS_NO_TICKER:
+            errors.append(f'No data found for ticker: {tickers[i]}')
+        elif code == _STATUS_INSUFFICIENT:
+            errors.append(f'Insufficient data for analysis. Need at least 2 data points, got {window_size[i]}')
+        elif code == _STATUS_NOT_FOUND:
+            errors.append(f'Event date {event_dates_raw[i]} not found in data range')
+        elif code == _STATUS_INVALID_DATE:
+            errors.append(f'Failed to compute event reaction: invalid event date {event_dates_raw[i]!r}')
+        else:
+            errors.append(None)
+    result['error'] = pd.Series(errors, dtype=object)
+
+    return result
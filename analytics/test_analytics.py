@@ -5,11 +5,17 @@ Test script for analytics functionality.
 import sys
 import os
 import logging
+import tempfile
+
+import pandas as pd
 
 # Add parent directory to path to allow importing from sibling modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from analytics.historical_analytics import load_price_data, get_price_summary, compute_event_reaction
+from analytics.historical_analytics import (
+    load_price_data, load_price_relation, get_price_summary, compute_event_reaction, compute_event_reactions_batch,
+    convert_prices_to_parquet, PriceStore
+)
 
 # Set up logging
 logging.basicConfig(
@@ -41,25 +47,20 @@ def test_load_price_data():
         logger.info("Creating DuckDB in-memory connection")
         con = duckdb.connect(database=':memory:')
 
-        # Determine table name
-        table_name = os.path.splitext(os.path.basename(csv_file))[0]
-        logger.info(f"Using table name: {table_name}")
+        # Query the CSV directly; no intermediate table is materialized
+        logger.info(f"Reading CSV relation: read_csv_auto('{csv_file}')")
+        relation = con.read_csv(csv_file)
 
-        # Load CSV into DuckDB
-        query = f"""
-        CREATE TABLE {table_name} AS
-        SELECT * FROM read_csv_auto('{csv_file}')
-        """
-        logger.info(f"Executing query: CREATE TABLE {table_name} AS SELECT * FROM read_csv_auto('{csv_file}')")
-        con.execute(query)
+        # Expose the relation as a view for the SQL queries below
+        table_name = os.path.splitext(os.path.basename(csv_file))[0]
+        relation.create_view(table_name)
 
         # Show schema
-        logger.info("Retrieving table schema")
+        logger.info("Retrieving relation schema")
         print("Schema:")
-        schema_result = con.execute(f"DESCRIBE {table_name}").fetchall()
         schema_info = []
-        for col in schema_result:
-            col_info = f"{col[0]}: {col[1]}"
+        for name, dtype in zip(relation.columns, relation.types):
+            col_info = f"{name}: {dtype}"
             schema_info.append(col_info)
             print(f"  {col_info}")
         logger.info(f"Table schema: {', '.join(schema_info)}")
@@ -68,8 +69,8 @@ def test_load_price_data():
         # Show data
         logger.info("Retrieving first 5 rows of data")
         print("Data (first 5 rows):")
-        data_result = con.execute(f"SELECT * FROM {table_name} LIMIT 5").fetchall()
-        headers = [col[0] for col in schema_result]
+        data_result = relation.limit(5).fetchall()
+        headers = relation.columns
 
         # Print headers
         print(" | ".join(f"{h:<12}" for h in headers))
@@ -166,6 +167,60 @@ def test_load_nonexistent_file():
         print(f"ERROR: Unexpected exception: {e}")
         return False
 
+def test_load_price_data_projection():
+    """
+    Test column projection and row filtering through the Parquet cache.
+    """
+    print("\nTesting load_price_data projection and filter...")
+    print("=" * 50)
+
+    try:
+        df = load_price_data("data/price_data.csv", columns=['date', 'symbol', 'close'], symbols=['AAPL'])
+
+        if list(df.columns) != ['date', 'symbol', 'close']:
+            print(f"ERROR: Unexpected columns: {list(df.columns)}")
+            return False
+        if len(df) == 0 or set(df['symbol']) != {'AAPL'}:
+            print(f"ERROR: Filter not applied, symbols: {set(df['symbol'])}")
+            return False
+        print(f"Projected DataFrame shape: {df.shape}")
+
+        relation = load_price_relation("data/price_data.csv", columns=['date', 'close'], symbols=['AAPL'],
+                                       start='2024-01-16', end='2024-01-17')
+        rows = relation.fetchall()
+        print(f"Lazy relation returned {len(rows)} rows: {rows}")
+        expected_dates = sorted(d for d in df['date'].dt.date if str(d) in ('2024-01-16', '2024-01-17'))
+        if sorted(row[0] for row in rows) != expected_dates:
+            print(f"ERROR: Date range not applied, dates: {[row[0] for row in rows]}")
+            return False
+
+        # Filter values are bound, not spliced into SQL
+        injected = load_price_data("data/price_data.csv", symbols=["AAPL' OR '1'='1"])
+        if len(injected) != 0 or len(load_price_data("data/price_data.csv", symbols=[])) != 0:
+            print(f"ERROR: Symbol filter matched {len(injected)} rows for a quoted symbol")
+            return False
+
+        # Converted Parquet files are laid out sorted by (symbol, date)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_path = convert_prices_to_parquet("data/price_data.csv", os.path.join(tmp_dir, "prices.parquet"))
+            full = pd.read_parquet(parquet_path, columns=['symbol', 'date'])
+        if not full.equals(full.sort_values(['symbol', 'date'], ignore_index=True)):
+            print("ERROR: Converted Parquet file is not sorted by (symbol, date)")
+            return False
+
+        store = PriceStore.from_csv("data/price_data.csv", symbols=['AAPL'])
+        if list(store.segments) != ['AAPL'] or store.segments['AAPL'] != (0, len(df)):
+            print(f"ERROR: Unexpected PriceStore segments: {store.segments}")
+            return False
+        print(f"PriceStore from CSV: {store.segments}")
+
+        print("\nSUCCESS: Projection and filter applied correctly!")
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Failed projected load: {e}")
+        return False
+
 def test_compute_event_reaction():
     """
     Test the compute_event_reaction function.
@@ -223,6 +278,40 @@ def test_compute_event_reaction():
         print(f"ERROR: Failed to compute event reaction: {e}")
         return False
 
+def test_compute_event_reactions_batch():
+    """
+    Test that the batch kernel agrees with compute_event_reaction on a shared PriceStore.
+    """
+    print("\nTesting compute_event_reactions_batch function...")
+    print("=" * 50)
+
+    try:
+        df = load_price_data("data/price_data.csv")
+        events = [("AAPL", "2024-01-17"), ("msft", "2024-01-15"), ("ZZZZ", "2024-01-15")]
+
+        store = PriceStore.from_frame(df)
+
+        batch = compute_event_reactions_batch(store, events)
+        print(batch[['ticker', 'event_date_found', 'event_price', '1_day_return', 'error']])
+
+        for i, (ticker, event_date) in enumerate(events):
+            single = compute_event_reaction(store, ticker, event_date)
+            row = batch.iloc[i]
+            if 'error' in single:
+                if row['error'] != single['error']:
+                    print(f"ERROR: Mismatched error for {ticker}: {row['error']} vs {single['error']}")
+                    return False
+            elif row['error'] is not None or abs(row['event_price'] - single['event_price']) > 1e-9:
+                print(f"ERROR: Batch result differs for {ticker} on {event_date}")
+                return False
+
+        print("\nSUCCESS: Batch event reactions match single-event results!")
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Failed to compute batch event reactions: {e}")
+        return False
+
 def main():
     """Run all analytics tests"""
     print("Running Analytics Module tests...\n")
@@ -233,16 +322,24 @@ def main():
     # Test error handling
     success2 = test_load_nonexistent_file()
 
+    # Test projected loading
+    success4 = test_load_price_data_projection()
+
     # Test event reaction computation
     success3 = test_compute_event_reaction()
 
+    # Test batch event reaction computation
+    success5 = test_compute_event_reactions_batch()
+
     print("\n" + "=" * 50)
     print("Analytics Test Summary:")
     print(f"Load price data: {'PASS' if success1 else 'FAIL'}")
     print(f"Error handling: {'PASS' if success2 else 'FAIL'}")
+    print(f"Projected load: {'PASS' if success4 else 'FAIL'}")
     print(f"Event reaction: {'PASS' if success3 else 'FAIL'}")
+    print(f"Batch event reaction: {'PASS' if success5 else 'FAIL'}")
 
-    if success1 and success2 and success3:
+    if success1 and success2 and success3 and success4 and success5:
         print("SUCCESS: All analytics tests passed!")
     else:
         print("FAILURE: Some tests failed!")
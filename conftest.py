@@ -0,0 +1,26 @@
+# Pytest configuration for Market Sentinel
+"""
+Makes the top-level packages (analytics, rag, scoring, ...) importable in tests
+by putting the repository root on sys.path once, before test modules are collected.
+
+The test modules are also runnable as scripts, so their test functions report
+success by returning True or False; under pytest a False return is a failure.
+"""
+
+import inspect
+import os
+import sys
+
+import pytest
+
+_REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Call the test function as pytest would, failing it if it returns False."""
+    testargs = {name: pyfuncitem.funcargs[name] for name in inspect.signature(pyfuncitem.obj).parameters}
+    if pyfuncitem.obj(**testargs) is False:
+        pytest.fail(f"{pyfuncitem.name} returned False", pytrace=False)
+    return True
@@ -1,34 +1,62 @@
 # Event ingestion module for Market Sentinel
-import pandas as pd
-import os
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
 import time
 
+# Restrict CSV type sniffing to what pandas would infer, so dates and other
+# text-like columns stay strings for downstream consumers
+_CSV_SOURCE = "read_csv_auto(?, auto_type_candidates = ['BOOLEAN', 'BIGINT', 'DOUBLE', 'VARCHAR'])"
+
+# Rows materialized per Arrow batch; keeps memory bounded on large files
+_BATCH_SIZE = 10_000
+
+# Newlines become spaces, in one pass over the string
+_CLEAN_TABLE = str.maketrans({'\n': ' ', '\r': ' '})
+
 def clean_text(text):
     if isinstance(text, str):
         # Basic cleaning: strip whitespace, remove problematic newlines
-        return text.strip().replace('\n', ' ').replace('\r', ' ')
+        return text.translate(_CLEAN_TABLE).strip()
     return text
 
-def stream_events(filename="data/events.csv", delay=1.0):
+def _clean_text_column(column):
+    """Arrow compute equivalent of clean_text for string columns; other columns pass through."""
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return pc.utf8_trim_whitespace(pc.replace_substring_regex(column, '[\r\n]', ' '))
+    return column
+
+def stream_events(filename="data/events.csv", delay=0.0):
     """
     Streams events from a CSV file in the data folder, cleans the text, and yields one event at a time.
-    
+
+    DuckDB parses the file in Arrow record batches, and string columns are
+    cleaned per batch with the Arrow compute equivalent of clean_text.
+
     Args:
         filename (str): Path to the CSV file.
-        delay (float): Delay in seconds between yielding events.
+        delay (float): Minimum interval in seconds between yielded events. Time the
+            consumer spends on an event counts towards the interval. 0 disables pacing.
 
     Yields:
         dict: The row data as a dictionary with cleaned text.
     """
-    if not os.path.exists(filename):
-        raise FileNotFoundError(f"Event file '{filename}' not found.")
-    events_df = pd.read_csv(filename)
-
-    # Assume we want to clean all string columns
-    string_columns = events_df.select_dtypes(include=['object']).columns
-    for col in string_columns:
-        events_df[col] = events_df[col].apply(clean_text)
-    
-    for _, row in events_df.iterrows():
-        yield row.to_dict()
-        time.sleep(delay)
+    with duckdb.connect(database=':memory:') as con:
+        # DuckDB opening the file doubles as the existence check
+        try:
+            batches = con.execute(f"SELECT * FROM {_CSV_SOURCE}", [filename]).fetch_record_batch(_BATCH_SIZE)
+        except duckdb.IOException as e:
+            if "No files found" in str(e):
+                raise FileNotFoundError(f"Event file '{filename}' not found.") from e
+            raise
+
+        for batch in batches:
+            # Assume we want to clean all string columns
+            cleaned = pa.RecordBatch.from_arrays(
+                [_clean_text_column(column) for column in batch.columns], schema=batch.schema
+            )
+            for row in cleaned.to_pylist():
+                next_time = time.monotonic() + delay
+                yield row
+                if delay > 0:
+                    time.sleep(max(0.0, next_time - time.monotonic()))
@@ -3,28 +3,31 @@ Test script that loads news_sample.csv and prints the first 3 streamed events.
 """
 
 import csv
-import os
 import time
 
-def stream_news_events(filename="data/news_sample.csv", delay=1.0):
+def stream_news_events(filename="data/news_sample.csv", delay=0.0):
     """
     Streams events from news_sample.csv and yields one event at a time.
 
     Args:
         filename (str): Path to the CSV file
-        delay (float): Delay in seconds between yielding events
+        delay (float): Minimum interval in seconds between yielded events (0 disables pacing)
 
     Yields:
         dict: The row data as a dictionary
     """
-    if not os.path.exists(filename):
-        raise FileNotFoundError(f"News file '{filename}' not found.")
+    try:
+        csvfile = open(filename, 'r', newline='', encoding='utf-8', buffering=1 << 20)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"News file '{filename}' not found.") from e
 
-    with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
+    with csvfile:
         reader = csv.DictReader(csvfile)
         for row in reader:
+            next_time = time.monotonic() + delay
             yield row
-            time.sleep(delay)
+            if delay > 0:
+                time.sleep(max(0.0, next_time - time.monotonic()))
 
 def main():
     """
@@ -35,7 +38,7 @@ def main():
 
     try:
         event_count = 0
-        for event in stream_news_events(delay=0.5):
+        for event in stream_news_events(delay=0):
             event_count += 1
             print(f"\nEvent #{event_count}:")
             print(f"Date: {event.get('date', 'N/A')}")
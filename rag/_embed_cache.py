@@ -0,0 +1,120 @@
+# Embedding Cache Module for Market Sentinel
+"""
+Persistent, content-addressed cache of text embeddings backed by SQLite.
+
+Vectors are keyed by a hash of the model name and the exact text, so a text is
+only ever encoded once per model, across processes and index rebuilds.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = "./embedding_cache.sqlite3"
+
+# Stay below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds
+_MAX_QUERY_PARAMS = 500
+
+def content_key(model_name: str, text: str) -> bytes:
+    """
+    Cache key for a text embedded with a given model.
+
+    Args:
+        model_name (str): Name of the embedding model
+        text (str): Text that was embedded
+
+    Returns:
+        bytes: 32-byte BLAKE2b digest of model_name + NUL + text
+    """
+    return hashlib.blake2b(f"{model_name}\0{text}".encode("utf-8"), digest_size=32).digest()
+
+class EmbedCache:
+    """
+    SQLite table of (hash, vector) pairs with float32 vectors stored as raw bytes.
+
+    A single connection is shared between threads behind a lock.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys (Sequence[bytes]): Keys from content_key
+
+        Returns:
+            Dict[bytes, np.ndarray]: float32 vectors for the keys that were found
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(unique_keys), _MAX_QUERY_PARAMS):
+                chunk = unique_keys[i:i + _MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", chunk
+                ).fetchall()
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32)
+        return found
+
+    def put_many(self, keys: Sequence[bytes], vectors: np.ndarray) -> None:
+        """
+        Store vectors, replacing any existing entries for the same keys.
+
+        Args:
+            keys (Sequence[bytes]): Keys from content_key
+            vectors (np.ndarray): One vector per key
+        """
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in zip(keys, vectors)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)", rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def embed_with_cache(cache: EmbedCache, model_name: str, texts: List[str], encode) -> np.ndarray:
+    """
+    Embed texts, calling encode only for texts missing from the cache.
+
+    Args:
+        cache (EmbedCache): Cache to read from and fill
+        model_name (str): Name of the embedding model, part of the cache key
+        texts (List[str]): Texts to embed
+        encode (Callable[[List[str]], np.ndarray]): Encodes a list of texts into one vector per text
+
+    Returns:
+        np.ndarray: float32 array of shape (len(texts), dim), rows in input order
+    """
+    keys = [content_key(model_name, text) for text in texts]
+    found = cache.get_many(keys)
+
+    # Encode each distinct missing text once
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        vectors = np.asarray(encode(list(missing.values())), dtype=np.float32)
+        cache.put_many(list(missing), vectors)
+        found.update(zip(missing, vectors))
+
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack([found[key] for key in keys])
@@ -1,109 +1,675 @@
 # Context Retrieval (RAG) Module for Market Sentinel
 
-import csv
+import collections
+import functools
+import hashlib
+import importlib.util
+import itertools
+import json
+import math
 import os
-from typing import List, Dict, Any
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
-def build_event_index(csv_file_path: str = "data/news_sample.csv", collection_name: str = "market_events") -> Dict[str, Any]:
+import numpy as np
+import pandas as pd
+
+from rag._embed_cache import EmbedCache, content_key, embed_with_cache
+
+_MODEL_NAME = 'all-MiniLM-L6-v2'
+_EMBEDDING_DIMENSION = 384  # Output dimension of all-MiniLM-L6-v2
+
+# Tokens per text seen by the model (all-MiniLM-L6-v2 defaults to 256). Event
+# headlines and summaries fit well within 128, and attention cost grows with its square.
+_MAX_SEQ_LENGTH = 128
+
+# Characters passed to the tokenizer; far more than _MAX_SEQ_LENGTH tokens, so
+# cutting there only skips tokenizing text the model would drop anyway
+_MAX_TEXT_CHARS = 2000
+
+# Embeddings are unit-normalized and truncated to _MAX_SEQ_LENGTH tokens, so they
+# get their own cache namespace
+_EMBEDDING_KEY = f"{_MODEL_NAME}:normalized:seq{_MAX_SEQ_LENGTH}"
+_ENCODE_BATCH_SIZE = 256
+
+# Headlines embedded per step by retrieve_stream
+_STREAM_BATCH_SIZE = 32
+
+# Event CSV columns used for embedding text and metadata
+_EVENT_TEXT_COLUMNS = ['date', 'title', 'content', 'source']
+_EVENT_SCORE_COLUMNS = ['sentiment_score', 'impact_score']
+
+# Vector search settings. Stored and query vectors are unit-normalized, so the
+# dot metric (distance = 1 - dot) equals cosine distance without per-pair norms.
+# Tables below _ANN_MIN_ROWS are searched by brute force, which is exact and fast
+# at that size (PQ training also needs 256+ rows).
+_DISTANCE_METRIC = "dot"
+_ANN_MIN_ROWS = 256
+_ANN_NPROBES = 20
+_ANN_REFINE_FACTOR = 10
+
+# Tables up to this size are searched exactly with NumPy on an in-memory copy of
+# the vectors, skipping LanceDB's per-query overhead
+_BRUTE_FORCE_MAX_ROWS = 5000
+
+# Columns returned by searches; the vector column is never read back
+_RESULT_COLUMNS = ['text', 'title', 'date', 'source', 'sentiment_score', 'impact_score']
+
+_LANCEDB_PATH = "./lancedb_store"
+
+# Lance file format for new tables. Its default string encodings already
+# compress text and metadata; forcing LZ4 per column made files larger.
+_LANCE_FILE_VERSION = "2.2"
+
+# Ids per delete predicate in incremental updates
+_DELETE_BATCH_SIZE = 500
+
+# Per table, how many times build_event_index has written it in this process
+_index_generations = collections.Counter()
+
+@functools.lru_cache(maxsize=1)
+def _get_model(name: str = _MODEL_NAME):
+    """
+    Load a sentence-transformers model once and reuse it for every later call.
+
+    With MKS_USE_ONNX=1 the model runs on ONNX Runtime (sentence-transformers'
+    onnx backend, which needs optimum[onnxruntime]); pooling and normalization
+    are unchanged. If the ONNX model cannot be loaded, the PyTorch model is used.
+    Either way, inputs are truncated to _MAX_SEQ_LENGTH tokens.
+
+    Raises:
+        ImportError: If sentence-transformers is not installed (not cached, so a
+            later install is picked up)
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = None
+    if os.environ.get("MKS_USE_ONNX") == "1":
+        try:
+            model = SentenceTransformer(name, backend="onnx")
+        except Exception as e:
+            # sentence-transformers < 3.2 has no backend argument; optimum may be missing
+            print(f"WARNING: ONNX backend unavailable ({e}). Using PyTorch.")
+
+    if model is None:
+        model = SentenceTransformer(name)
+
+        # Half precision roughly doubles GPU throughput; embeddings are stored as float32 anyway
+        if model.device.type == 'cuda':
+            model.half()
+
+    model.max_seq_length = _MAX_SEQ_LENGTH
+    return model
+
+@functools.lru_cache(maxsize=1)
+def _get_embed_cache() -> Optional[EmbedCache]:
+    """Open the on-disk embedding cache once; None if it cannot be opened (e.g. read-only directory)."""
+    try:
+        return EmbedCache()
+    except sqlite3.Error:
+        return None
+
+@functools.lru_cache(maxsize=1)
+def _get_db():
+    """
+    Connect to the LanceDB store once per process.
+
+    Raises:
+        ImportError: If lancedb is not installed
+    """
+    import lancedb
+    return lancedb.connect(_LANCEDB_PATH)
+
+@functools.lru_cache(maxsize=8)
+def _get_table(collection_name: str):
+    """
+    Open a LanceDB table once and reuse the handle.
+
+    build_event_index clears this cache when it rewrites a table; writes made by
+    other processes are not picked up until then.
+    """
+    return _get_db().open_table(collection_name)
+
+@functools.lru_cache(maxsize=8)
+def _get_memory_index(collection_name: str) -> Optional[tuple]:
+    """
+    Load a small table's vectors and result columns into memory once.
+
+    Vectors are widened from the stored float16 to float32, because NumPy has no
+    BLAS path for float16 and its half-precision matmul is many times slower.
+    build_event_index clears this cache whenever it writes a table.
+
+    Returns:
+        Optional[tuple]: (float32 (n, dim) matrix, result columns as Python lists),
+            or None if the table has more than _BRUTE_FORCE_MAX_ROWS rows
+    """
+    table = _get_table(collection_name)
+    if table.count_rows() > _BRUTE_FORCE_MAX_ROWS:
+        return None
+
+    data = table.to_arrow()
+    vectors = data["vector"].combine_chunks()
+    matrix = vectors.flatten().to_numpy(zero_copy_only=False).reshape(-1, vectors.type.list_size)
+    columns = {name: data[name].to_pylist() for name in _RESULT_COLUMNS if name in data.column_names}
+    return matrix.astype(np.float32), columns
+
+def index_generation(collection_name: str = "market_events") -> int:
+    """
+    Number of times build_event_index has rewritten or updated a table in this process.
+
+    Callers that cache search results compare it with the value they saw when
+    filling the cache, and drop the cache when it changed.
+    """
+    return _index_generations[collection_name]
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit L2 norm (all-zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+
+def _mock_embed(texts: List[str]) -> np.ndarray:
+    """
+    Random embeddings used when sentence-transformers is not installed.
+
+    Each row is seeded from a stable hash of its text, so the same text always gets
+    the same vector (across processes too) and a query matches its own event.
+    """
+    embeddings = np.empty((len(texts), _EMBEDDING_DIMENSION), dtype=np.float32)
+    for i, text in enumerate(texts):
+        seed = int.from_bytes(content_key("mock", text)[:8], "little")
+        embeddings[i] = np.random.default_rng(seed).random(_EMBEDDING_DIMENSION, dtype=np.float32)
+    return embeddings
+
+def _embed_cached(texts: List[str], batch_size: int = _ENCODE_BATCH_SIZE, show_progress_bar: bool = False) -> np.ndarray:
+    """
+    Embed texts with the shared model, encoding only texts missing from the embedding cache.
+
+    Embeddings are L2-normalized, so distances between them rank like cosine similarity.
+
+    Args:
+        texts (List[str]): Texts to embed
+        batch_size (int): Batch size passed to model.encode for cache misses
+        show_progress_bar (bool): Whether model.encode shows a progress bar
+
+    Returns:
+        np.ndarray: float32 embeddings, one row per text
+
+    Raises:
+        ImportError: If sentence-transformers is not installed and a text is not cached
+    """
+    def encode(missing: List[str]) -> np.ndarray:
+        return _get_model().encode(
+            [text[:_MAX_TEXT_CHARS] for text in missing],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=show_progress_bar
+        )
+
+    cache = _get_embed_cache()
+    if cache is None:
+        return np.asarray(encode(texts), dtype=np.float32)
+    return embed_with_cache(cache, _EMBEDDING_KEY, texts, encode)
+
+@functools.lru_cache(maxsize=1024)
+def _embed_query(text: str) -> np.ndarray:
+    """
+    Embedding of a single query text, memoized for the life of the process.
+
+    Repeated queries skip both the model and the SQLite cache lookup. The
+    returned array is shared between callers, so it is made read-only.
+
+    Raises:
+        ImportError: If sentence-transformers is not installed and the text is not cached
+    """
+    vector = _embed_cached([text])[0]
+    vector.flags.writeable = False
+    return vector
+
+def embed_query(text: str) -> np.ndarray:
+    """
+    Embed a query the same way the retrievers do.
+
+    Args:
+        text (str): Query or headline text
+
+    Returns:
+        np.ndarray: Unit-normalized float32 vector; a mock embedding if
+            sentence-transformers is not installed
+    """
+    try:
+        return _normalize(_embed_query(text)[np.newaxis])[0]
+    except ImportError:
+        return _normalize(_mock_embed([text]))[0]
+
+def embed_queries(texts: List[str]) -> np.ndarray:
+    """
+    Embed many queries in one model call; row i equals embed_query(texts[i]).
+
+    Args:
+        texts (List[str]): Query or headline texts
+
+    Returns:
+        np.ndarray: Unit-normalized float32 vectors, one row per text; mock
+            embeddings if sentence-transformers is not installed
+    """
+    try:
+        return _normalize(_embed_cached(texts))
+    except ImportError:
+        return _normalize(_mock_embed(texts))
+
+def _create_vector_index(table, row_count: int, embedding_dimension: int) -> Optional[float]:
+    """
+    Build an IVF-PQ index on the vector column so searches stop scanning every row.
+
+    Args:
+        table: LanceDB table with a 'vector' column
+        row_count (int): Number of rows in the table
+        embedding_dimension (int): Length of each vector
+
+    Returns:
+        Optional[float]: Seconds spent building the index, or None if the table is too small to index
+    """
+    if row_count < _ANN_MIN_ROWS:
+        return None
+
+    num_partitions = max(1, int(math.sqrt(row_count)))
+    # PQ splits each vector into equal sub-vectors; use the largest divisor up to 96
+    num_sub_vectors = max(d for d in range(1, min(96, embedding_dimension) + 1) if embedding_dimension % d == 0)
+
+    start = time.perf_counter()
+    try:
+        from lancedb.index import IvfPq
+        table.create_index("vector", config=IvfPq(
+            distance_type=_DISTANCE_METRIC, num_partitions=num_partitions, num_sub_vectors=num_sub_vectors
+        ))
+    except ImportError:
+        # Older lancedb without index config objects
+        table.create_index(
+            metric=_DISTANCE_METRIC, num_partitions=num_partitions,
+            num_sub_vectors=num_sub_vectors, vector_column_name="vector"
+        )
+    return time.perf_counter() - start
+
+def _vector_search(table, vector, limit: int):
+    """
+    Nearest-neighbour query over the 'vector' column; the ANN settings only apply once an index exists.
+
+    Only the result columns present in the table are projected (plus _distance),
+    so the vector column is not read back for the hits.
+    """
+    names = set(table.schema.names)
+    columns = [name for name in _RESULT_COLUMNS if name in names] + ["_distance"]
+    return (
+        table.search(vector, vector_column_name="vector")
+        .select(columns)
+        .metric(_DISTANCE_METRIC)
+        .nprobes(_ANN_NPROBES)
+        .refine_factor(_ANN_REFINE_FACTOR)
+        .limit(limit)
+    )
+
+def _events_to_arrow(ids: List[str], texts: List[str], embeddings: np.ndarray, metadata_df: pd.DataFrame):
+    """
+    Assemble event rows into a pyarrow Table for LanceDB.
+
+    Embeddings become a fixed-size list column over one contiguous float16 buffer,
+    so LanceDB needs no per-row conversion or schema inference. Half precision
+    halves the bytes read by brute-force scans and index refinement; the rounding
+    (~1e-3 relative) is far below the gap between neighbouring similarity scores.
+
+    Args:
+        ids (List[str]): Row id of each event
+        texts (List[str]): Embedded text of each event
+        embeddings (np.ndarray): (n, dim) embedding matrix
+        metadata_df (pd.DataFrame): date, title, source, sentiment_score and impact_score columns
+
+    Returns:
+        pa.Table: id, text, vector and metadata columns
+    """
+    import pyarrow as pa
+
+    vectors = np.ascontiguousarray(embeddings, dtype=np.float16)
+    dimension = vectors.shape[1]
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("text", pa.string()),
+        ("vector", pa.list_(pa.float16(), dimension)),
+        ("date", pa.string()),
+        ("title", pa.string()),
+        ("source", pa.string()),
+        ("sentiment_score", pa.float64()),
+        ("impact_score", pa.float64()),
+    ])
+    columns = [
+        pa.array(ids, type=pa.string()),
+        pa.array(texts, type=pa.string()),
+        pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1), type=pa.float16()), dimension),
+    ]
+    columns += [
+        pa.array(metadata_df[field.name].tolist(), type=field.type)
+        for field in list(schema)[3:]
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+def _create_table(db, collection_name: str, data):
+    """Create or replace a table in the _LANCE_FILE_VERSION format, or lancedb's default where unsupported."""
+    try:
+        return db.create_table(
+            collection_name, data=data, mode="overwrite",
+            storage_options={"new_table_data_storage_version": _LANCE_FILE_VERSION}
+        )
+    except (TypeError, ValueError):
+        # Older lancedb has no storage_options here, or does not know this version
+        return db.create_table(collection_name, data=data, mode="overwrite")
+
+def _sentinel_path(collection_name: str) -> str:
+    return os.path.join(_LANCEDB_PATH, f"{collection_name}.built_at")
+
+def _read_build_sentinel(collection_name: str) -> Optional[Dict[str, Any]]:
+    """Build info written by the last successful build_event_index, or None if absent or unreadable."""
+    try:
+        with open(_sentinel_path(collection_name), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_build_sentinel(collection_name: str, info: Dict[str, Any]) -> None:
+    try:
+        with open(_sentinel_path(collection_name), 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+    except OSError as e:
+        # Only costs a rebuild next time
+        print(f"WARNING: Could not write build sentinel: {e}")
+
+def _remove_build_sentinel(collection_name: str) -> None:
+    try:
+        os.remove(_sentinel_path(collection_name))
+    except FileNotFoundError:
+        pass
+
+def _file_digest(path: str) -> str:
+    """BLAKE2b hex digest of a file's bytes, read in 1 MiB chunks."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _reusable_build(collection_name: str, csv_file_path: str, csv_mtime: float) -> Optional[Dict[str, Any]]:
+    """
+    Info of the existing table if it was built from a CSV with the same content, else None.
+
+    The same path and modification time count as unchanged without reading the
+    file; otherwise the file's hash is compared, so a touched or copied but
+    identical CSV is still reused. A table built with other embeddings (mock
+    embeddings once sentence-transformers is installed, or an older model
+    configuration) is not reused.
+    """
+    info = _read_build_sentinel(collection_name)
+    if not info:
+        return None
+    if info.get("embedding") not in ("mock", _EMBEDDING_KEY):
+        return None
+    if info.get("embedding") == "mock" and importlib.util.find_spec("sentence_transformers") is not None:
+        return None
+    try:
+        _get_table(collection_name)
+    except Exception:
+        return None
+
+    csv_file_path = os.path.abspath(csv_file_path)
+    if info.get("csv_file_path") != csv_file_path or info.get("csv_mtime") != csv_mtime:
+        if info.get("csv_hash") != _file_digest(csv_file_path):
+            return None
+        # Record the new path and mtime so the next call skips hashing
+        info = {**info, "csv_file_path": csv_file_path, "csv_mtime": csv_mtime}
+        _write_build_sentinel(collection_name, info)
+    return info
+
+def _event_ids(texts: List[str], metadata_df: pd.DataFrame) -> List[str]:
+    """
+    Row ids derived from each event's stored content, so an unchanged event keeps its id across builds.
+
+    Identical rows are told apart by occurrence: the first copy of an event is
+    event_<hash>, later copies event_<hash>_<n>. Removing or adding a copy then
+    deletes or adds exactly one row, as a full rebuild would.
+    """
+    fields = [metadata_df[name].astype(str) for name in ['date', 'title', 'source'] + _EVENT_SCORE_COLUMNS]
+    seen = collections.Counter()
+    ids = []
+    for row in zip(texts, *fields):
+        event_id = "event_" + hashlib.blake2b("\0".join(row).encode('utf-8'), digest_size=8).hexdigest()
+        occurrence = seen[event_id]
+        seen[event_id] += 1
+        ids.append(f"{event_id}_{occurrence}" if occurrence else event_id)
+    return ids
+
+def _open_for_update(collection_name: str) -> Optional[tuple]:
+    """
+    Open an existing table for an incremental update.
+
+    Returns:
+        Optional[tuple]: (table, set of stored ids, embedding kind, embedding dimension),
+            or None if the table has to be rebuilt: it is missing, has no sentinel
+            or id column, holds duplicate ids, or holds mock embeddings while
+            sentence-transformers is installed
+    """
+    info = _read_build_sentinel(collection_name)
+    if not info:
+        return None
+    if info.get("embedding") == "mock" and importlib.util.find_spec("sentence_transformers") is not None:
+        return None
+    try:
+        table = _get_table(collection_name)
+        if "id" not in table.schema.names:
+            return None
+        stored_ids = table.search().select(["id"]).limit(None).to_arrow()["id"].to_pylist()
+    except Exception:
+        return None
+    unique_ids = set(stored_ids)
+    if len(unique_ids) != len(stored_ids):
+        # Built before duplicate rows got distinct ids
+        return None
+    return table, unique_ids, info.get("embedding"), info.get("embedding_dimension")
+
+def _delete_events(table, event_ids) -> int:
+    """Delete rows by id; ids from _event_ids are hex digests and digits, so they need no escaping."""
+    event_ids = sorted(event_ids)
+    for i in range(0, len(event_ids), _DELETE_BATCH_SIZE):
+        chunk = event_ids[i:i + _DELETE_BATCH_SIZE]
+        table.delete("id IN (" + ", ".join(f"'{event_id}'" for event_id in chunk) + ")")
+    return len(event_ids)
+
+def _embed_documents(texts: List[str]):
+    """
+    Embed event texts for storage, falling back to mock embeddings without sentence-transformers.
+
+    Returns:
+        tuple: (unit-normalized embeddings, embedding kind recorded in the build sentinel)
+    """
+    # Generate embeddings using sentence-transformers
+    print("Generating embeddings with sentence-transformers...")
+    try:
+        # Embed with the all-MiniLM-L6-v2 model; unchanged texts come from the cache
+        embeddings = _embed_cached(texts, show_progress_bar=True)
+        embedding_kind = _EMBEDDING_KEY
+        print(f"Generated embeddings with shape: {embeddings.shape}")
+
+    except ImportError:
+        print("WARNING: sentence-transformers not available. Using mock embeddings.")
+        print("To install: pip install sentence-transformers")
+        # Create mock embeddings for demonstration
+        embeddings = _mock_embed(texts)
+        embedding_kind = "mock"
+
+    # The dot metric assumes unit vectors; the model already normalizes, mocks do not
+    return _normalize(embeddings), embedding_kind
+
+def build_event_index(csv_file_path: str = "data/news_sample.csv", collection_name: str = "market_events",
+                      force: bool = False) -> Dict[str, Any]:
     """
     Loads a CSV file of past events, generates embeddings using sentence-transformers,
     and stores them in a LanceDB table.
 
+    A sentinel file next to the table records the CSV it was built from. If the
+    CSV is unchanged since (same path and modification time, or same content
+    hash), the existing table is reused and nothing is re-encoded. Otherwise an existing table is updated
+    in place: events not yet stored are embedded and added, and events no longer
+    in the CSV are deleted. Rows are matched by a hash of their content and, for identical rows, their occurrence.
+
     Args:
         csv_file_path (str): Path to the CSV file containing past events
         collection_name (str): Name for the LanceDB table
+        force (bool): Rebuild the whole table even if it is up to date
 
     Returns:
-        dict: Dictionary containing collection info and status
+        dict: Dictionary containing collection info and status; 'reused' is True
+            when the existing table was kept, and 'added_count' / 'removed_count'
+            give the rows written and deleted
     """
     try:
         # Check if CSV file exists
         if not os.path.exists(csv_file_path):
             raise FileNotFoundError(f"CSV file '{csv_file_path}' not found.")
 
-        # Load CSV file
+        csv_mtime = os.path.getmtime(csv_file_path)
+        if not force:
+            info = _reusable_build(collection_name, csv_file_path, csv_mtime)
+            if info is not None:
+                print(f"LanceDB table '{collection_name}' is up to date with {csv_file_path}; skipping rebuild.")
+                return {
+                    "status": "success",
+                    "collection_name": collection_name,
+                    "document_count": info.get("document_count"),
+                    "embedding_dimension": info.get("embedding_dimension"),
+                    "vector_index": info.get("vector_index"),
+                    "index_build_seconds": None,
+                    "lancedb_path": _LANCEDB_PATH,
+                    "reused": True
+                }
+
+        # Hashed before reading, so a later edit makes the recorded hash stale rather than wrong
+        csv_hash = _file_digest(csv_file_path)
+
+        # Load CSV file as strings; empty cells stay '' as with csv.DictReader
         print(f"Loading events from {csv_file_path}...")
-        events_data = []
-        with open(csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                events_data.append(row)
-        print(f"Loaded {len(events_data)} events from CSV.")
+        events_df = pd.read_csv(csv_file_path, dtype=str, keep_default_na=False, encoding='utf-8')
+        events_df = events_df.reindex(columns=_EVENT_TEXT_COLUMNS + _EVENT_SCORE_COLUMNS, fill_value='')
+        print(f"Loaded {len(events_df)} events from CSV.")
+
+        # Events with neither title nor content have nothing to embed
+        titles = events_df['title'].str.strip()
+        contents = events_df['content'].str.strip()
+        empty = (titles == '') & (contents == '')
+        if empty.any():
+            print(f"Skipping {int(empty.sum())} events with no title or content.")
+            events_df, titles, contents = events_df[~empty], titles[~empty], contents[~empty]
 
         # Prepare texts for embedding (combine title and content for richer context)
-        texts = []
-        metadatas = []
-
-        for row in events_data:
-            # Combine title and content for embedding
-            text = f"{row.get('title', '')}. {row.get('content', '')}"
-            texts.append(text.strip())
-
-            # Store metadata for each event
-            metadata = {
-                "date": str(row.get("date", "")),
-                "title": str(row.get("title", "")),
-                "source": str(row.get("source", "")),
-                "sentiment_score": float(row.get("sentiment_score", 0.0) or 0.0),
-                "impact_score": float(row.get("impact_score", 0.0) or 0.0)
+        separators = np.where((titles != '') & (contents != ''), '. ', '')
+        texts = (titles + separators + contents).tolist()
+        if not texts:
+            # A header-only CSV, or one whose rows are all empty; any existing table is left as it is
+            print("No events with a title or content to index.")
+            return {
+                "status": "error",
+                "error": "no events to index"
             }
-            metadatas.append(metadata)
+        long_texts = sum(len(text) > _MAX_TEXT_CHARS for text in texts)
+        if long_texts:
+            print(f"{long_texts} texts exceed {_MAX_TEXT_CHARS} characters; only the start of each is embedded.")
 
-        print(f"Prepared {len(texts)} text documents for embedding.")
-
-        # Generate embeddings using sentence-transformers
-        print("Generating embeddings with sentence-transformers...")
-        try:
-            from sentence_transformers import SentenceTransformer
+        # Store metadata for each event; missing or malformed scores become 0.0
+        scores = events_df[_EVENT_SCORE_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0.0)
+        metadata_df = pd.concat([events_df[['date', 'title', 'source']], scores.astype(float)], axis=1)
 
-            # Load the all-MiniLM-L6-v2 model
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            embeddings = model.encode(texts, show_progress_bar=True)
-
-            print(f"Generated embeddings with shape: {embeddings.shape}")
-            embedding_dimension = embeddings.shape[1]
+        ids = _event_ids(texts, metadata_df)
+        print(f"Prepared {len(texts)} text documents for embedding.")
 
-        except ImportError:
-            print("WARNING: sentence-transformers not available. Using mock embeddings.")
-            print("To install: pip install sentence-transformers")
-            # Create mock embeddings for demonstration
-            import random
-            random.seed(42)  # For reproducible results
-            embedding_dimension = 384  # Typical dimension for MiniLM models
-            embeddings = []
-            for i in range(len(texts)):
-                # Generate mock embedding vector
-                embedding = [random.random() for _ in range(embedding_dimension)]
-                embeddings.append(embedding)
+        # Rows already in the table are kept as they are; only new rows are embedded
+        existing = None if force else _open_for_update(collection_name)
+        stored_ids = existing[1] if existing else set()
+        new_rows = [i for i, event_id in enumerate(ids) if event_id not in stored_ids]
+        if existing:
+            print(f"{len(new_rows)} of {len(texts)} events are not in LanceDB table '{collection_name}' yet.")
+
+        if new_rows or existing is None:
+            embeddings, embedding_kind = _embed_documents([texts[i] for i in new_rows])
+        else:
+            embeddings, embedding_kind = None, existing[2]
+        if existing and embedding_kind != existing[2]:
+            # New vectors would not be comparable with the stored ones
+            print("Embedding model changed since the last build; rebuilding the whole table.")
+            existing, new_rows = None, list(range(len(texts)))
+            embeddings, embedding_kind = _embed_documents(texts)
+        embedding_dimension = embeddings.shape[1] if embeddings is not None else existing[3]
 
         # Store in LanceDB table
         try:
-            import lancedb
-
-            # Initialize LanceDB connection
-            db = lancedb.connect("./lancedb_store")
-
-            # Prepare data for LanceDB
-            data = []
-            for i, (text, embedding, metadata) in enumerate(zip(texts, embeddings, metadatas)):
-                row = {
-                    "id": f"event_{i}",
-                    "text": text,
-                    "vector": embedding,
-                    **metadata  # Include all metadata fields
-                }
-                data.append(row)
-
-            # Create or replace table
-            table = db.create_table(collection_name, data=data, mode="overwrite")
-            print(f"Successfully stored {len(data)} events in LanceDB table '{collection_name}'")
+            # The old sentinel is dropped first so a failed update is never
+            # mistaken for an up-to-date table
+            _remove_build_sentinel(collection_name)
+
+            if existing is None:
+                # Initialize LanceDB connection
+                db = _get_db()
+
+                # Prepare data for LanceDB as one Arrow table, with all metadata fields
+                data = _events_to_arrow(ids, texts, embeddings, metadata_df)
+
+                # Create or replace table
+                table = _create_table(db, collection_name, data)
+                _get_table.cache_clear()
+                removed_count = 0
+                print(f"Successfully stored {data.num_rows} events in LanceDB table '{collection_name}'")
+            else:
+                table = existing[0]
+                stale_ids = stored_ids.difference(ids)
+                removed_count = _delete_events(table, stale_ids)
+                if new_rows:
+                    table.add(_events_to_arrow(
+                        [ids[i] for i in new_rows], [texts[i] for i in new_rows],
+                        embeddings, metadata_df.iloc[new_rows]
+                    ))
+                if new_rows or stale_ids:
+                    # Compact the new fragments and add the new rows to any vector index
+                    table.optimize()
+                print(f"Added {len(new_rows)} and removed {removed_count} events in LanceDB table '{collection_name}'")
+            _get_memory_index.cache_clear()
+            _index_generations[collection_name] += 1
+
+            row_count = table.count_rows()
+            index_build_seconds = None
+            if not table.list_indices():
+                index_build_seconds = _create_vector_index(table, row_count, embedding_dimension)
+                if index_build_seconds is not None:
+                    print(f"Built IVF-PQ vector index in {index_build_seconds:.2f}s")
+
+            vector_index = "IVF_PQ" if table.list_indices() else None
+            _write_build_sentinel(collection_name, {
+                "csv_file_path": os.path.abspath(csv_file_path),
+                "csv_mtime": csv_mtime,
+                "csv_hash": csv_hash,
+                "embedding": embedding_kind,
+                "document_count": row_count,
+                "embedding_dimension": embedding_dimension,
+                "vector_index": vector_index
+            })
 
             return {
                 "status": "success",
                 "collection_name": collection_name,
-                "document_count": len(texts),
+                "document_count": row_count,
                 "embedding_dimension": embedding_dimension,
-                "lancedb_path": "./lancedb_store"
+                "vector_index": vector_index,
+                "index_build_seconds": index_build_seconds,
+                "lancedb_path": _LANCEDB_PATH,
+                "reused": False,
+                "added_count": len(new_rows),
+                "removed_count": removed_count
             }
 
         except ImportError:
@@ -124,6 +690,112 @@ def build_event_index(csv_file_path: str = "data/news_sample.csv", collection_na
             "error": str(e)
         }
 
+def _brute_force_search(memory_index: tuple, query_vectors: np.ndarray, top_k: int) -> List[Dict[str, list]]:
+    """
+    Exact top_k by dot distance, in the same column layout as LanceDB results.
+
+    Each query is scored with its own matrix-vector product rather than one
+    matrix product for the batch, so a query's scores do not depend on which
+    other queries it was batched with.
+    """
+    matrix, columns = memory_index
+    k = max(0, min(top_k, matrix.shape[0]))
+
+    results = []
+    for vector in query_vectors:
+        row = 1.0 - matrix @ vector
+        nearest = np.argpartition(row, k - 1)[:k] if 0 < k < row.shape[0] else np.arange(k)
+        nearest = nearest[np.argsort(row[nearest], kind="stable")]
+        hits = {name: [values[i] for i in nearest] for name, values in columns.items()}
+        hits["_distance"] = row[nearest].tolist()
+        results.append(hits)
+    return results
+
+def _search(collection_name: str, query_vectors: np.ndarray, top_k: int) -> List[Dict[str, list]]:
+    """
+    Run one nearest-neighbour query per row of query_vectors against a table.
+
+    Small tables are searched in memory (see _get_memory_index); larger ones
+    through LanceDB, using the vector index once one exists.
+
+    Returns:
+        List[Dict[str, list]]: Per query, the result columns as Python lists
+    """
+    query_vectors = _normalize(query_vectors)
+    memory_index = _get_memory_index(collection_name)
+    if memory_index is not None:
+        return _brute_force_search(memory_index, query_vectors, top_k)
+
+    # Open the table (connection and handle are reused across calls)
+    table = _get_table(collection_name)
+    return [_vector_search(table, vector, top_k).to_arrow().to_pydict() for vector in query_vectors]
+
+def _result_column(results: Dict[str, list], name: str, default: Any) -> list:
+    """A result column, or default for every row if the table lacks it."""
+    if name in results:
+        return results[name]
+    return [default] * len(next(iter(results.values()), []))
+
+def _format_similar_events(results: Dict[str, list]) -> List[Dict[str, Any]]:
+    distances = _result_column(results, "_distance", 0)  # LanceDB returns _distance
+    columns = zip(
+        distances,
+        _result_column(results, "title", ""),
+        _result_column(results, "date", ""),
+        _result_column(results, "source", ""),
+        _result_column(results, "sentiment_score", 0.0),
+        _result_column(results, "impact_score", 0.0),
+        _result_column(results, "text", "")
+    )
+    return [
+        {
+            "rank": i + 1,
+            "similarity_score": 1 - distance,
+            "distance": distance,
+            "title": title,
+            "date": date,
+            "source": source,
+            "sentiment_score": sentiment_score,
+            "impact_score": impact_score,
+            "content": text
+        }
+        for i, (distance, title, date, source, sentiment_score, impact_score, text) in enumerate(columns)
+    ]
+
+def _format_query_result(headline: str, hits: Dict[str, list]) -> Dict[str, Any]:
+    similar_events = _format_similar_events(hits)
+    return {
+        "query_headline": headline,
+        "similar_events": similar_events,
+        "total_retrieved": len(similar_events)
+    }
+
+def warm_up(collection_name: str = "market_events") -> Dict[str, bool]:
+    """
+    Load the embedding model and open a table ahead of the first query.
+
+    The handles are process-wide singletons, so later retrievals in this
+    process reuse them instead of paying the load on the first request.
+
+    Args:
+        collection_name (str): Name of the table to open
+
+    Returns:
+        Dict[str, bool]: Whether the model and the table could be loaded
+    """
+    status = {'embedding_model': True, 'table': True}
+    try:
+        _get_model()
+    except Exception as e:
+        print(f"WARNING: Could not load embedding model ({e}).")
+        status['embedding_model'] = False
+    try:
+        _get_memory_index(collection_name)
+    except Exception as e:
+        print(f"WARNING: Could not open table '{collection_name}' ({e}).")
+        status['table'] = False
+    return status
+
 def retrieve_relevant_context(query: str, collection_name: str = "market_events", n_results: int = 5) -> Dict[str, Any]:
     """
     Retrieve relevant context from the event index based on a query.
@@ -137,44 +809,35 @@ def retrieve_relevant_context(query: str, collection_name: str = "market_events"
         dict: Dictionary containing retrieved documents and metadata
     """
     try:
-        import lancedb
-
-        # Initialize LanceDB connection
-        db = lancedb.connect("./lancedb_store")
-
-        # Open the table
-        table = db.open_table(collection_name)
-
         # Generate embedding for query
         try:
-            from sentence_transformers import SentenceTransformer
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            query_embedding = model.encode([query])[0]
+            query_vectors = _embed_query(query)[np.newaxis]
         except ImportError:
             # Fallback to mock embedding
-            import random
-            random.seed(42)
-            query_embedding = [random.random() for _ in range(384)]
+            query_vectors = _mock_embed([query])
 
         # Query the table
-        results = table.search(query_embedding, vector_column_name="vector").limit(n_results).to_pandas()
-
-        # Format results similar to LanceDB format
-        documents = []
-        metadatas = []
-        distances = []
-
-        for _, row in results.iterrows():
-            documents.append(row.get("text", ""))
-            metadata = {
-                "title": row.get("title", ""),
-                "date": row.get("date", ""),
-                "source": row.get("source", ""),
-                "sentiment_score": row.get("sentiment_score", 0.0),
-                "impact_score": row.get("impact_score", 0.0)
+        results = _search(collection_name, query_vectors, n_results)[0]
+
+        # Format results similar to LanceDB format, column-at-a-time on the Arrow result
+        documents = _result_column(results, "text", "")
+        distances = _result_column(results, "_distance", 0)
+        metadatas = [
+            {
+                "title": title,
+                "date": date,
+                "source": source,
+                "sentiment_score": sentiment_score,
+                "impact_score": impact_score
             }
-            metadatas.append(metadata)
-            distances.append(row.get("_distance", 0))
+            for title, date, source, sentiment_score, impact_score in zip(
+                _result_column(results, "title", ""),
+                _result_column(results, "date", ""),
+                _result_column(results, "source", ""),
+                _result_column(results, "sentiment_score", 0.0),
+                _result_column(results, "impact_score", 0.0)
+            )
+        ]
 
         return {
             "status": "success",
@@ -202,58 +865,64 @@ def retrieve_similar_events(headline: str, collection_name: str = "market_events
     Returns:
         dict: Dictionary containing similar events with metadata and similarity scores
     """
+    result = retrieve_batch([headline], collection_name=collection_name, top_k=top_k)
+    if result["status"] != "success":
+        return result
+
+    similar = result["results"][0]
+    print(f"Retrieved {similar['total_retrieved']} similar events from LanceDB")
+    return {
+        "status": "success",
+        "query_headline": headline,
+        "similar_events": similar["similar_events"],
+        "total_retrieved": similar["total_retrieved"]
+    }
+
+def retrieve_batch(headlines: List[str], collection_name: str = "market_events", top_k: int = 3) -> Dict[str, Any]:
+    """
+    Find similar past events for many headlines with a single embedding call.
+
+    All headlines are encoded together, then searched one after another against
+    the same open table.
+
+    Args:
+        headlines (List[str]): Headlines to find similar events for
+        collection_name (str): Name of the LanceDB table
+        top_k (int): Number of similar events to retrieve per headline
+
+    Returns:
+        dict: Dictionary with a 'results' list holding, per headline in input order,
+            its query_headline, similar_events and total_retrieved
+    """
     try:
-        # Generate embedding for the headline
-        print(f"Generating embedding for headline: {headline}")
+        # Generate embeddings for all headlines
+        if len(headlines) == 1:
+            print(f"Generating embedding for headline: {headlines[0]}")
+        else:
+            print(f"Generating embeddings for {len(headlines)} headlines")
         try:
-            from sentence_transformers import SentenceTransformer
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            headline_embedding = model.encode([headline])[0]
+            if len(headlines) == 1:
+                query_vectors = _embed_query(headlines[0])[np.newaxis]
+            else:
+                query_vectors = _embed_cached(headlines)
             print("Embedding generated using sentence-transformers")
         except ImportError:
             print("WARNING: sentence-transformers not available. Using mock embedding.")
             print("To install: pip install sentence-transformers")
             # Fallback to mock embedding
-            import random
-            random.seed(42)
-            headline_embedding = [random.random() for _ in range(384)]
+            query_vectors = _mock_embed(headlines)
 
         # Query LanceDB for similar events
         try:
-            import lancedb
-
-            # Initialize LanceDB connection
-            db = lancedb.connect("./lancedb_store")
-
-            # Open the table
-            table = db.open_table(collection_name)
-
             # Search for similar vectors
-            results = table.search(headline_embedding, vector_column_name="vector").limit(top_k).to_pandas()
-
-            # Format the results
-            similar_events = []
-            for i, row in results.iterrows():
-                event = {
-                    "rank": i + 1,
-                    "similarity_score": 1 - row.get("_distance", 0),  # LanceDB returns _distance
-                    "distance": row.get("_distance", 0),
-                    "title": row.get("title", ""),
-                    "date": row.get("date", ""),
-                    "source": row.get("source", ""),
-                    "sentiment_score": row.get("sentiment_score", 0.0),
-                    "impact_score": row.get("impact_score", 0.0),
-                    "content": row.get("text", "")
-                }
-                similar_events.append(event)
-
-            print(f"Retrieved {len(similar_events)} similar events from LanceDB")
+            results = [
+                _format_query_result(headline, hits)
+                for headline, hits in zip(headlines, _search(collection_name, query_vectors, top_k))
+            ]
 
             return {
                 "status": "success",
-                "query_headline": headline,
-                "similar_events": similar_events,
-                "total_retrieved": len(similar_events)
+                "results": results
             }
 
         except ImportError:
@@ -272,8 +941,46 @@ def retrieve_similar_events(headline: str, collection_name: str = "market_events
             }
 
     except Exception as e:
-        print(f"ERROR: Unexpected error in retrieve_similar_events: {e}")
+        print(f"ERROR: Unexpected error in retrieve_batch: {e}")
         return {
             "status": "error",
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+def retrieve_stream(headlines: Iterable[str], collection_name: str = "market_events", top_k: int = 3,
+                    batch_size: int = _STREAM_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Find similar past events for a stream of headlines, overlapping embedding with search.
+
+    Headlines are taken batch_size at a time. While one batch is searched, the
+    next is embedded on a worker thread, so model and LanceDB time overlap.
+
+    Args:
+        headlines (Iterable[str]): Headlines to find similar events for; may be a generator
+        collection_name (str): Name of the LanceDB table
+        top_k (int): Number of similar events to retrieve per headline
+        batch_size (int): Number of headlines embedded together
+
+    Yields:
+        dict: Per headline in input order, its query_headline, similar_events and
+            total_retrieved (same shape as the items of retrieve_batch's results)
+
+    Raises:
+        Exception: Errors opening or searching the table are raised to the caller,
+            as a generator cannot return an error status
+    """
+    pending_headlines = iter(headlines)
+    batches = iter(lambda: list(itertools.islice(pending_headlines, batch_size)), [])
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        batch = next(batches, None)
+        pending = executor.submit(embed_queries, batch) if batch else None
+        while pending is not None:
+            current, query_vectors = batch, pending.result()
+
+            # Start embedding the next batch before searching this one
+            batch = next(batches, None)
+            pending = executor.submit(embed_queries, batch) if batch else None
+
+            for headline, hits in zip(current, _search(collection_name, query_vectors, top_k)):
+                yield _format_query_result(headline, hits)
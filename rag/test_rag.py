@@ -1,14 +1,18 @@
 """
 Test script for RAG (Retrieval-Augmented Generation) functionality.
+
+Run from the repository root with `python -m rag.test_rag` or `python -m pytest`.
 """
 
-import sys
 import os
+import shutil
+import tempfile
 
-# Add parent directory to path to allow importing from sibling modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
 
-from rag.context_retrieval import build_event_index, retrieve_relevant_context, retrieve_similar_events
+from rag.context_retrieval import build_event_index, retrieve_relevant_context, retrieve_similar_events, retrieve_batch, retrieve_stream
+from rag.context_retrieval import _get_db, _get_table
+from rag._embed_cache import EmbedCache, embed_with_cache
 
 def test_build_event_index():
     """
@@ -42,6 +46,132 @@ def test_build_event_index():
         print(f"Unexpected error during testing: {e}")
         return {"status": "error", "error": str(e)}
 
+def test_build_event_index_reuse():
+    """
+    Test that a CSV with unchanged content reuses the existing table and a modified one only updates changed rows.
+    """
+    print("\nTesting build_event_index reuse...")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = os.path.join(tmp_dir, "news_sample.csv")
+        shutil.copyfile("data/news_sample.csv", csv_file)
+
+        # The copy has the same content as the sample data, so only force rebuilds it
+        copied = build_event_index(csv_file_path=csv_file, collection_name="test_market_events")
+        first = build_event_index(csv_file_path=csv_file, collection_name="test_market_events", force=True)
+        second = build_event_index(csv_file_path=csv_file, collection_name="test_market_events")
+        mtime = os.path.getmtime(csv_file)
+        os.utime(csv_file, (mtime + 10, mtime + 10))
+        touched = build_event_index(csv_file_path=csv_file, collection_name="test_market_events")
+
+        # Replace the first event with a new one; only that row should change
+        with open(csv_file, encoding='utf-8') as f:
+            header, first_event, *other_events = f.read().splitlines()
+        new_event = "2024-02-01,New Event Headline,Freshly published content,Reuters,0.1,0.3"
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join([header, *other_events, new_event]) + "\n")
+        updated = build_event_index(csv_file_path=csv_file, collection_name="test_market_events")
+
+    # Rebuild from the sample data so the next test run can reuse the table
+    build_event_index(csv_file_path="data/news_sample.csv", collection_name="test_market_events")
+
+    reused = [result.get('reused') for result in (copied, first, second, touched)]
+    print(f"Reused: {reused}")
+    if any(result.get('status') != 'success' for result in (copied, first, second, touched)):
+        print("ERROR: Index build failed")
+        return False
+    if reused != [True, False, True, True]:
+        print("ERROR: Table was not reused exactly when the CSV content was unchanged")
+        return False
+    if second.get('document_count') != first.get('document_count'):
+        print("ERROR: Reused build reported a different document count")
+        return False
+    print(f"Incremental update: added {updated.get('added_count')}, removed {updated.get('removed_count')}")
+    if (updated.get('status') != 'success' or updated.get('added_count') != 1
+            or updated.get('removed_count') != 1 or updated.get('document_count') != first.get('document_count')):
+        print("ERROR: Changed CSV did not update just the changed rows")
+        return False
+
+    print("\nSUCCESS: Unchanged CSV skipped the rebuild and changed rows were updated in place!")
+    return True
+
+def _stored_ids(collection_name):
+    return sorted(_get_table(collection_name).to_arrow()["id"].to_pylist())
+
+def test_build_event_index_duplicates():
+    """
+    Test that incremental updates add and remove copies of a duplicated row like a full rebuild does.
+    """
+    print("\nTesting build_event_index with duplicate rows...")
+    print("=" * 50)
+
+    with open("data/news_sample.csv", encoding='utf-8') as f:
+        header, duplicate, *other_events = f.read().splitlines()
+
+    steps = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = os.path.join(tmp_dir, "news_duplicates.csv")
+        try:
+            # Two copies, then one (a copy removed), then three (two copies added)
+            for copies in (2, 1, 3):
+                with open(csv_file, 'w', encoding='utf-8') as f:
+                    f.write("\n".join([header, *[duplicate] * copies, *other_events]) + "\n")
+                updated = build_event_index(csv_file_path=csv_file, collection_name="test_duplicate_events")
+                rebuilt = build_event_index(csv_file_path=csv_file, collection_name="test_duplicate_events_rebuilt",
+                                            force=True)
+                steps.append((copies, updated, rebuilt, _stored_ids("test_duplicate_events"),
+                              _stored_ids("test_duplicate_events_rebuilt")))
+        finally:
+            for name in ("test_duplicate_events", "test_duplicate_events_rebuilt"):
+                _get_db().drop_table(name, ignore_missing=True)
+            _get_table.cache_clear()
+
+    for copies, updated, rebuilt, updated_ids, rebuilt_ids in steps:
+        print(f"{copies} copies: {len(updated_ids)} rows updated in place "
+              f"(added {updated.get('added_count')}, removed {updated.get('removed_count')}), "
+              f"{len(rebuilt_ids)} rebuilt")
+        if updated.get('status') != 'success' or rebuilt.get('status') != 'success':
+            print("ERROR: Index build failed")
+            return False
+        if updated_ids != rebuilt_ids or len(updated_ids) != len(other_events) + copies:
+            print("ERROR: Incremental update differs from a full rebuild")
+            return False
+
+    print("\nSUCCESS: Duplicate rows were added and removed one copy at a time!")
+    return True
+
+def test_build_event_index_no_events():
+    """
+    Test that a CSV without any event to embed is reported as an error, not a crash.
+    """
+    print("\nTesting build_event_index with no events...")
+    print("=" * 50)
+
+    header = "date,title,content,source,sentiment_score,impact_score"
+    bodies = {
+        "header only": header + "\n",
+        "empty rows": header + "\n2024-01-15,, ,Reuters,0.1,0.2\n2024-01-16,,,Reuters,0.0,0.0\n",
+    }
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for case, body in bodies.items():
+            csv_file = os.path.join(tmp_dir, "news_empty.csv")
+            with open(csv_file, 'w', encoding='utf-8') as f:
+                f.write(body)
+            results[case] = build_event_index(csv_file_path=csv_file, collection_name="test_empty_events")
+
+    created = "test_empty_events" in _get_db().list_tables().tables
+    for case, result in results.items():
+        print(f"{case}: {result}")
+    if created or any(result != {"status": "error", "error": "no events to index"} for result in results.values()):
+        print("ERROR: CSVs without events were not reported as having nothing to index")
+        return False
+
+    print("\nSUCCESS: CSVs without events were reported as having nothing to index!")
+    return True
+
 def test_retrieve_relevant_context():
     """
     Test the retrieve_relevant_context function.
@@ -129,17 +259,125 @@ def test_retrieve_similar_events():
     except Exception as e:
         print(f"Unexpected error during similar events retrieval: {e}")
 
+def test_retrieve_batch():
+    """
+    Test the retrieve_batch function.
+    """
+    print("\nTesting retrieve_batch function...")
+    print("=" * 50)
+
+    headlines = ["Apple announces major product recall", "Federal Reserve raises interest rates"]
+
+    try:
+        result = retrieve_batch(headlines, collection_name="test_market_events", top_k=2)
+
+        print(f"Status: {result.get('status', 'unknown')}")
+        if result.get('status') != 'success':
+            print(f"\nERROR: {result.get('error', 'Unknown error')}")
+            return False
+
+        results = result.get('results', [])
+        for item in results:
+            titles = [event.get('title', 'N/A') for event in item.get('similar_events', [])]
+            print(f"{item.get('query_headline')}: {titles}")
+
+        if [item.get('query_headline') for item in results] != headlines:
+            print("ERROR: Batch results are not in input order")
+            return False
+
+        print("\nSUCCESS: Batch retrieval completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Unexpected error during batch retrieval: {e}")
+        return False
+
+def test_retrieve_stream():
+    """
+    Test that retrieve_stream yields the same results as retrieve_batch, in order.
+    """
+    print("\nTesting retrieve_stream function...")
+    print("=" * 50)
+
+    headlines = ["Apple announces major product recall", "Federal Reserve raises interest rates",
+                 "Tech Stocks Rally on Positive Earnings"]
+
+    try:
+        # batch_size=2 makes the stream prefetch a second, partial batch
+        streamed = list(retrieve_stream(iter(headlines), collection_name="test_market_events",
+                                        top_k=2, batch_size=2))
+        batch = retrieve_batch(headlines, collection_name="test_market_events", top_k=2)
+
+        if batch.get('status') != 'success':
+            print(f"\nERROR: {batch.get('error', 'Unknown error')}")
+            return False
+
+        for item in streamed:
+            titles = [event.get('title', 'N/A') for event in item.get('similar_events', [])]
+            print(f"{item.get('query_headline')}: {titles}")
+
+        if streamed != batch.get('results'):
+            print("ERROR: Streamed results differ from retrieve_batch")
+            return False
+
+        print("\nSUCCESS: Streaming retrieval completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Unexpected error during streaming retrieval: {e}")
+        return False
+
+def test_embed_cache():
+    """
+    Test that cached embeddings are reused and only misses are encoded.
+    """
+    print("\nTesting embedding cache...")
+    print("=" * 50)
+
+    encoded = []
+
+    def fake_encode(texts):
+        encoded.extend(texts)
+        return np.array([[len(text), 1.0, 2.0] for text in texts], dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = EmbedCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        try:
+            first = embed_with_cache(cache, "test-model", ["a", "bb", "a"], fake_encode)
+            second = embed_with_cache(cache, "test-model", ["bb", "ccc"], fake_encode)
+            other_model = embed_with_cache(cache, "other-model", ["a"], fake_encode)
+        finally:
+            cache.close()
+
+    print(f"Encoded texts: {encoded}")
+    if encoded != ["a", "bb", "ccc", "a"]:
+        print("ERROR: Cached texts were encoded again")
+        return False
+    if first.shape != (3, 3) or not np.array_equal(second[0], first[1]) or other_model[0][0] != 1.0:
+        print("ERROR: Cached vectors were not returned in input order")
+        return False
+
+    print("\nSUCCESS: Embedding cache reused stored vectors!")
+    return True
+
 def main():
     """Run all RAG tests"""
     print("Running RAG (Retrieval-Augmented Generation) tests...\n")
 
+    test_embed_cache()
+
     # Test building the index
     build_result = test_build_event_index()
 
     # Only test retrieval if build was successful or partially successful
     if build_result.get('status') in ['success', 'partial']:
+        test_build_event_index_reuse()
+        test_build_event_index_duplicates()
+        test_build_event_index_no_events()
         test_retrieve_relevant_context()
         test_retrieve_similar_events()
+        test_retrieve_batch()
+        test_retrieve_stream()
 
     print("\n" + "=" * 50)
     print("RAG testing completed!")
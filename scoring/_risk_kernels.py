@@ -0,0 +1,116 @@
+# Risk scoring kernels for Market Sentinel
+"""
+Numeric risk factor kernels over plain counts and floats.
+
+The analyze_*_risk functions in risk_engine reduce an event to these inputs
+and call the scalar kernels; score_events_batch gathers the inputs of a whole
+batch into struct-of-arrays form and calls factor_points_batch once. Missing
+returns and volatility are passed as NaN and skipped explicitly, so fastmath
+is deliberately not enabled.
+
+Cascaded threshold checks are bin lookups: np.searchsorted over the sorted
+thresholds picks the index into a points table, without branching.
+"""
+
+import numpy as np
+
+from utils.jit import njit, prange
+
+# Price reaction thresholds as sorted bin edges, with the points for each bin.
+# Average return: below -5% scores 15, below -2% scores 8 (searchsorted side='right')
+_RETURN_THRESHOLDS = np.array([-0.05, -0.02])
+_RETURN_POINTS = np.array([15, 8, 0])
+# Annualized volatility: above 30% scores 5, above 50% scores 10 (side='left')
+_VOL_THRESHOLDS = np.array([0.3, 0.5])
+_VOL_POINTS = np.array([0, 5, 10])
+
+@njit(cache=True)
+def sentiment_kernel(neg_count, pos_count, neg_similar_count):
+    """Sentiment risk (0-30 points) from negative/positive keyword and negative similar event counts."""
+    score = 0
+    if neg_count > 0:
+        score += min(15, neg_count * 5)
+    if pos_count > 0:
+        score -= min(5, pos_count * 2)
+    if neg_similar_count > 0:
+        score += min(15, neg_similar_count * 3)
+    return max(0, score)
+
+@njit(cache=True)
+def impact_kernel(impact_count, high_impact_similar):
+    """Impact risk (0-25 points) from impact keyword and high-impact similar event counts."""
+    score = 0
+    if impact_count > 0:
+        score += min(10, impact_count * 3)
+    if high_impact_similar > 0:
+        score += min(15, high_impact_similar * 4)
+    return max(0, score)
+
+@njit(cache=True)
+def similar_kernel(risk_factor_count, similar_count):
+    """Similar events risk (0-20 points) from risk factor and similar event counts."""
+    score = risk_factor_count * 2
+    if similar_count > 3:
+        score += 10
+    elif similar_count > 1:
+        score += 5
+    return min(20, score)
+
+@njit(cache=True)
+def price_kernel(returns_arr, ann_vol):
+    """
+    Price reaction risk (0-25 points).
+
+    Args:
+        returns_arr (np.ndarray): 1/3/5-day returns as float64, NaN where missing
+        ann_vol (float): Annualized 20-day volatility, NaN if missing
+
+    Returns:
+        int: Price reaction points
+    """
+    score = 0
+
+    total = 0.0
+    worst = np.inf
+    n = 0
+    for value in returns_arr:
+        if not np.isnan(value):
+            total += value
+            worst = min(worst, value)
+            n += 1
+    if n > 0:
+        score += int(_RETURN_POINTS[np.searchsorted(_RETURN_THRESHOLDS, total / n, side='right')])
+        score += 10 * int(worst < -0.10)
+
+    # searchsorted would put NaN in the top bin
+    if not np.isnan(ann_vol):
+        score += int(_VOL_POINTS[np.searchsorted(_VOL_THRESHOLDS, ann_vol, side='left')])
+
+    return min(25, score)
+
+@njit(parallel=True, cache=True)
+def factor_points_batch(neg_counts, pos_counts, neg_similar_counts, impact_counts, high_impact_similar,
+                        risk_factor_counts, similar_counts, returns, ann_vols, has_price):
+    """
+    Per-factor risk points for a batch of events, one event per prange iteration.
+
+    Args:
+        neg_counts, pos_counts, neg_similar_counts, impact_counts, high_impact_similar,
+        risk_factor_counts, similar_counts (np.ndarray): int64 per-event counts
+        returns (np.ndarray): float64 array of shape (n, 3) of 1/3/5-day returns, NaN where missing
+        ann_vols (np.ndarray): float64 annualized volatility per event, NaN where missing
+        has_price (np.ndarray): bool, False where the price reaction lookup failed
+
+    Returns:
+        np.ndarray: int64 array of shape (n, 4) with the sentiment, impact, similar
+            events and price reaction points of each event
+    """
+    n_events = len(neg_counts)
+    points = np.zeros((n_events, 4), dtype=np.int64)
+    for i in prange(n_events):
+        points[i, 0] = sentiment_kernel(neg_counts[i], pos_counts[i], neg_similar_counts[i])
+        points[i, 1] = impact_kernel(impact_counts[i], high_impact_similar[i])
+        points[i, 2] = similar_kernel(risk_factor_counts[i], similar_counts[i])
+        if has_price[i]:
+            points[i, 3] = price_kernel(returns[i], ann_vols[i])
+    return points
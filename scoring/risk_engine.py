@@ -1,21 +1,265 @@
 # Risk Scoring Engine for Market Sentinel
 
-from typing import Dict, Any
-import sys
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 import os
 
-# Add parent directory to path to allow importing from sibling modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+
+from rag.context_retrieval import embed_queries, embed_query, index_generation, retrieve_batch, retrieve_similar_events
+from rag.context_retrieval import warm_up as _warm_up_retrieval
+from analytics.historical_analytics import PriceStore, compute_event_reaction
+from understanding.event_understanding import analyze_event, analyze_events
+from understanding.event_understanding import warm_up as _warm_up_understanding
+from scoring._risk_kernels import sentiment_kernel, impact_kernel, similar_kernel, price_kernel, factor_points_batch
+
+logger = logging.getLogger(__name__)
+
+# Title keywords, matched as substrings of the lowercased title
+_NEGATIVE_KEYWORDS = ('faces', 'investigation', 'probe', 'recall', 'lawsuit', 'crisis', 'scandal',
+                      'violation', 'penalty', 'ban', 'shutdown', 'failure', 'breach')
+_POSITIVE_KEYWORDS = ('rally', 'surge', 'strong', 'positive', 'gains', 'success', 'breakthrough')
+_HIGH_IMPACT_KEYWORDS = ('major', 'massive', 'significant', 'historic', 'unprecedented',
+                         'revolutionary', 'breakthrough', 'crisis', 'emergency')
+
+# Recommendations per risk level; anything other than High or Medium gets Low's
+_RECOMMENDATIONS = {
+    "High": (
+        "[HIGH RISK] IMMEDIATE ATTENTION REQUIRED",
+        "Consider immediate position adjustments or hedging",
+        "Monitor news feeds and social media closely",
+        "Prepare contingency plans for further developments",
+        "Consult with risk management team immediately"
+    ),
+    "Medium": (
+        "[MEDIUM RISK] INCREASED MONITORING RECOMMENDED",
+        "Review and potentially adjust position sizing",
+        "Stay informed about related news developments",
+        "Consider setting additional stop-loss levels",
+        "Monitor competitor reactions and market sentiment"
+    ),
+    "Low": (
+        "[LOW RISK] NORMAL MONITORING PROCEDURES",
+        "Continue standard market monitoring",
+        "Note event for regular portfolio review",
+        "No immediate action required",
+        "Maintain existing risk management protocols"
+    ),
+}
+
+# Horizons of the N-day returns in a market reaction
+_REACTION_DAYS = (1, 3, 5)
+
+@functools.lru_cache(maxsize=4096)
+def _scan_title(title: str) -> tuple:
+    """
+    Keywords present in a title, matched case-insensitively.
+
+    Cached on the raw title, so the title is lowercased and scanned once no
+    matter how many analyzers look at it.
+
+    Returns:
+        tuple: (negative, positive, high-impact) keyword tuples, each in keyword list order
+    """
+    title_lower = title.lower()
+    return tuple(
+        tuple(keyword for keyword in keywords if keyword in title_lower)
+        for keywords in (_NEGATIVE_KEYWORDS, _POSITIVE_KEYWORDS, _HIGH_IMPACT_KEYWORDS)
+    )
 
-from rag.context_retrieval import retrieve_similar_events
-from analytics.historical_analytics import load_price_data, compute_event_reaction
-from understanding.event_understanding import analyze_event
+_NO_KEYWORDS = ((), (), ())
+
+def _scan_title_or_empty(title: Optional[str]) -> tuple:
+    """_scan_title, skipped for a missing or empty title."""
+    return _scan_title(title) if title else _NO_KEYWORDS
+
+class ProximityCache:
+    """
+    Bounded LRU cache keyed by unit-normalized embeddings, matched approximately.
+
+    A lookup finds the cached key with the highest dot product in one
+    matrix-vector product and returns its value if the cosine distance is at
+    most tau. When full, the least recently used entry is replaced. Safe to
+    share between threads.
+    """
+
+    def __init__(self, capacity: int = 1024, tau: float = 0.05):
+        self.capacity = capacity
+        self.tau = tau
+        self._lock = threading.Lock()
+        self._keys = None  # (capacity, dim) matrix, allocated on the first put
+        self._values = [None] * capacity
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._size = 0
+        self._clock = 0
+
+    def get(self, vector: np.ndarray) -> Optional[Any]:
+        """
+        Look up the value stored under the nearest key.
+
+        Args:
+            vector (np.ndarray): Unit-normalized query embedding
+
+        Returns:
+            Optional[Any]: The cached value, or None if no key is within tau
+        """
+        with self._lock:
+            if self._size == 0:
+                return None
+            similarities = self._keys[:self._size] @ vector
+            nearest = int(np.argmax(similarities))
+            if 1.0 - similarities[nearest] > self.tau:
+                return None
+            self._touch(nearest)
+            return self._values[nearest]
+
+    def put(self, vector: np.ndarray, value: Any) -> None:
+        """
+        Store a value under an embedding, evicting the least recently used entry if full.
+
+        Args:
+            vector (np.ndarray): Unit-normalized key embedding
+            value (Any): Value to return for nearby queries
+        """
+        with self._lock:
+            if self._keys is None:
+                self._keys = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            if self._size < self.capacity:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+            self._keys[slot] = vector
+            self._values[slot] = value
+            self._touch(slot)
+
+    def clear(self) -> None:
+        """Drop every entry, leaving the cache as newly constructed."""
+        with self._lock:
+            self._keys = None
+            self._values = [None] * self.capacity
+            self._last_used = np.zeros(self.capacity, dtype=np.int64)
+            self._size = 0
+            self._clock = 0
+
+    def _touch(self, slot: int) -> None:
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+# Similar-event results for recent headlines, reused for paraphrases, and the
+# index_generation of market_events they were retrieved from
+_similar_events_cache = ProximityCache()
+_similar_events_generation = index_generation("market_events")
+_similar_events_lock = threading.Lock()
+
+def _current_similar_events_generation() -> int:
+    """
+    index_generation of market_events, emptying _similar_events_cache first if
+    build_event_index has written the table since the cache was filled.
+    """
+    global _similar_events_generation
+    generation = index_generation("market_events")
+    with _similar_events_lock:
+        if generation != _similar_events_generation:
+            _similar_events_cache.clear()
+            _similar_events_generation = generation
+    return generation
+
+def _cache_similar_result(query_vector: np.ndarray, result: Dict[str, Any], generation: int) -> None:
+    """Cache a result retrieved at generation, unless the table was written while it was retrieved."""
+    with _similar_events_lock:
+        if generation == index_generation("market_events") == _similar_events_generation:
+            _similar_events_cache.put(query_vector, result)
+
+def _retrieve_similar_events_cached(headline: str) -> Dict[str, Any]:
+    """
+    retrieve_similar_events for the market_events table, answered from
+    _similar_events_cache when a previous headline was nearly identical.
+
+    Only successful results are cached, and the cache is emptied whenever
+    build_event_index writes the table. Callers get their own copies of the
+    result dict and event dicts.
+    """
+    generation = _current_similar_events_generation()
+    query_vector = embed_query(headline)
+    cached = _similar_events_cache.get(query_vector)
+    if cached is None:
+        result = retrieve_similar_events(headline=headline, collection_name="market_events", top_k=5)
+        if result.get('status') != 'success':
+            return result
+        _cache_similar_result(query_vector, result, generation)
+        cached = result
+    return _copy_similar_result(cached, headline)
+
+def _copy_similar_result(cached: Dict[str, Any], headline: str) -> Dict[str, Any]:
+    """A caller's own copy of a cached similar-events result, answering headline."""
+    return {
+        **cached,
+        'query_headline': headline,
+        'similar_events': [dict(similar_event) for similar_event in cached.get('similar_events', [])]
+    }
+
+def _retrieve_similar_events_batch(headlines: List[str]) -> List[Dict[str, Any]]:
+    """
+    _retrieve_similar_events_cached for many headlines, with one embedding call
+    for all of them and one retrieve_batch call for the cache misses.
+
+    A miss that is within the cache's distance of an earlier miss in the same
+    batch shares its result, as it would have when scored one after another.
+    """
+    generation = _current_similar_events_generation()
+    unique_headlines = list(dict.fromkeys(headlines))
+    query_vectors = embed_queries(unique_headlines)
+
+    answers = {}  # headline -> cached result, or the earlier miss it shares a result with
+    pending = ProximityCache(capacity=max(1, len(unique_headlines)), tau=_similar_events_cache.tau)
+    misses = []
+    for headline, query_vector in zip(unique_headlines, query_vectors):
+        cached = _similar_events_cache.get(query_vector)
+        if cached is None:
+            cached = pending.get(query_vector)
+        if cached is None:
+            pending.put(query_vector, headline)
+            misses.append(headline)
+            cached = headline
+        answers[headline] = cached
+
+    if misses:
+        batch = retrieve_batch(misses, collection_name="market_events", top_k=5)
+        if batch.get('status') == 'success':
+            miss_vectors = dict(zip(unique_headlines, query_vectors))
+            for similar in batch['results']:
+                result = {'status': 'success', **similar}
+                _cache_similar_result(miss_vectors[similar['query_headline']], result, generation)
+                answers[similar['query_headline']] = result
+        else:
+            for headline in misses:
+                answers[headline] = batch
+
+    results = []
+    for headline in headlines:
+        answer = answers[headline]
+        if isinstance(answer, str):
+            answer = answers[answer]
+        if answer.get('status') != 'success':
+            results.append(dict(answer))
+        else:
+            results.append(_copy_similar_result(answer, headline))
+    return results
 
 def score_event_risk(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Main risk scoring function that combines RAG and analytics to assess event risk.
 
     Uses similar events and market reaction metrics to compute a comprehensive risk score.
+    Synchronous entry point for score_event_risk_async; it also works when an event loop
+    is already running in the current thread (e.g. in an async web route or a notebook),
+    although awaiting score_event_risk_async there avoids blocking that loop.
 
     Args:
         event (Dict[str, Any]): Event data with keys like 'title', 'ticker', 'date', etc.
@@ -23,243 +267,534 @@ def score_event_risk(event: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Risk assessment with score, similar events, and market metrics
     """
-    # Initialize result variables
-    similar_result = {'status': 'error', 'similar_events': []}
-    reaction_result = {'error': 'No market reaction analysis performed'}
+    return _run_sync(score_event_risk_async, event)
+
+async def score_event_risk_async(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async version of score_event_risk.
 
+    The Mistral analysis, similar-event retrieval and market reaction computation do
+    not depend on each other, so they run concurrently in worker threads and the
+    wall time is that of the slowest one. Their results are then combined exactly
+    as if they had run one after another.
+
+    Analyses are memoized by exact headline (see analyze_event), and similar events
+    are reused for headlines within a small embedding distance of an earlier one
+    (see ProximityCache).
+
+    Args:
+        event (Dict[str, Any]): Event data with keys like 'title', 'ticker', 'date', etc.
+
+    Returns:
+        Dict[str, Any]: Risk assessment with score, similar events, and market metrics
+    """
     try:
-        risk_assessment = {
-            'event_title': event.get('title', ''),
-            'event_ticker': event.get('ticker', ''),
-            'event_date': event.get('date', ''),
-            'risk_score': 0.0,
-            'risk_factors': [],
-            'similar_events': [],
-            'market_reaction': {},
-            'recommendations': []
-        }
-
-        # Step 0: Analyze event with Mistral AI
-        ai_analysis = {'status': 'error', 'analysis': {}}
-        if 'title' in event and event['title']:
-            print(f"Analyzing event with Mistral AI: {event['title']}")
+        title, ticker, date = event.get('title'), event.get('ticker'), event.get('date')
+        has_title = bool(title)
+        has_ticker_and_date = bool(ticker and date)
+        if not has_title and not has_ticker_and_date:
+            return _unscorable(event)
+
+        if has_title:
+            logger.info("Analyzing event with Mistral AI: %s", title)
+            logger.info("Retrieving similar events for: %s", title)
+        if has_ticker_and_date:
+            logger.info("Computing market reaction for %s on %s", ticker, date)
+
+        # Exceptions are returned rather than raised, so each is handled like its stage failing
+        ai_outcome, similar_outcome, reaction_outcome = await asyncio.gather(
+            asyncio.to_thread(analyze_event, title) if has_title else _skipped(),
+            asyncio.to_thread(_retrieve_similar_events_cached, title) if has_title else _skipped(),
+            asyncio.to_thread(_compute_market_reaction, ticker, date) if has_ticker_and_date else _skipped(),
+            return_exceptions=True
+        )
+
+        return _build_risk_result(event, ai_outcome, similar_outcome, reaction_outcome, _assessment_timestamp())
+
+    except Exception as e:
+        return _critical_error(event, e)
+
+def score_events_batch(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Score many events at once; each result matches score_event_risk for that event.
+
+    Synchronous entry point for score_events_batch_async; like score_event_risk, it
+    may be called while an event loop is running.
+
+    Args:
+        events (List[Dict[str, Any]]): Events with keys like 'title', 'ticker', 'date', etc.
+
+    Returns:
+        List[Dict[str, Any]]: Risk assessments in input order
+    """
+    return _run_sync(score_events_batch_async, events)
+
+async def score_events_batch_async(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Async version of score_events_batch.
+
+    Each scoring stage runs once for the whole batch, and the three stages run
+    concurrently: distinct headlines are split into at most
+    _MAX_CONCURRENT_ANALYSES groups analyzed concurrently with analyze_events,
+    which asks the LLM about several headlines per request, similar events are
+    retrieved with one embedding call and one batched search, and market
+    reactions are computed in one worker thread from a single PriceStore.
+    The factor points of all events then come from one factor_points_batch
+    call over struct-of-arrays inputs.
+
+    Args:
+        events (List[Dict[str, Any]]): Events with keys like 'title', 'ticker', 'date', etc.
+
+    Returns:
+        List[Dict[str, Any]]: Risk assessments in input order
+    """
+    titles = [event.get('title') or None for event in events]
+    headlines = list(dict.fromkeys(title for title in titles if title is not None))
+    reaction_events = [
+        (i, event['ticker'], event['date']) for i, event in enumerate(events)
+        if event.get('ticker') and event.get('date')
+    ]
+    logger.info("Scoring %d events: %d distinct headlines, %d market reactions",
+                len(events), len(headlines), len(reaction_events))
+
+    # Contiguous groups of headlines, each analyzed by one analyze_events call
+    group_size = max(1, -(-len(headlines) // _MAX_CONCURRENT_ANALYSES))
+    groups = [headlines[i:i + group_size] for i in range(0, len(headlines), group_size)]
+
+    def compute_reactions():
+        outcomes = {}
+        for i, ticker, date in reaction_events:
             try:
-                ai_analysis = {
-                    'status': 'success',
-                    'analysis': analyze_event(event['title'])
-                }
-                print(f"Mistral analysis complete: {ai_analysis['analysis'].get('sentiment', 'Unknown')}")
+                outcomes[i] = _compute_market_reaction(ticker, date)
             except Exception as e:
-                ai_analysis = {
-                    'status': 'error',
-                    'error': str(e),
-                    'analysis': {}
-                }
-                print(f"Warning: Mistral analysis failed: {e}")
-
-        # Step 1: Retrieve similar events using RAG
-        if 'title' in event and event['title']:
-            print(f"Retrieving similar events for: {event['title']}")
-            similar_result = retrieve_similar_events(
-                headline=event['title'],
-                collection_name="market_events",
-                top_k=5
-            )
-
-            if similar_result.get('status') == 'success':
-                risk_assessment['similar_events'] = similar_result.get('similar_events', [])
-
-                # Analyze similar events for risk patterns
-                negative_events = 0
-                high_impact_events = 0
-
-                for similar_event in risk_assessment['similar_events']:
-                    sentiment = similar_event.get('sentiment_score', 0)
-                    impact = similar_event.get('impact_score', 0)
-
-                    if sentiment < -0.3:  # Negative sentiment
-                        negative_events += 1
-                    if impact > 0.7:  # High impact
-                        high_impact_events += 1
-
-                # Risk factor from similar events
-                if negative_events > 0:
-                    risk_assessment['risk_factors'].append(f"Found {negative_events} similar negative events")
-                    risk_assessment['risk_score'] += negative_events * 0.2
-
-                if high_impact_events > 0:
-                    risk_assessment['risk_factors'].append(f"Found {high_impact_events} similar high-impact events")
-                    risk_assessment['risk_score'] += high_impact_events * 0.15
-
-                print(f"Found {len(risk_assessment['similar_events'])} similar events")
-            else:
-                risk_assessment['risk_factors'].append("Could not retrieve similar events")
-                print(f"Warning: {similar_result.get('error', 'Unknown error retrieving similar events')}")
-        else:
-            risk_assessment['risk_factors'].append("No event title provided for similarity analysis")
+                outcomes[i] = e
+        return outcomes
+
+    analysis_task = asyncio.gather(*(asyncio.to_thread(analyze_events, group) for group in groups),
+                                   return_exceptions=True)
+    similar_task = (asyncio.to_thread(_retrieve_similar_events_batch, headlines) if headlines else _skipped())
+    analyses, similar_results, reactions = await asyncio.gather(
+        analysis_task, similar_task, asyncio.to_thread(compute_reactions), return_exceptions=True
+    )
+
+    # A failed batch stage fails that stage for every event, as it would have one at a time
+    ai_by_headline = {}
+    for group, group_analyses in zip(groups, analyses):
+        if isinstance(group_analyses, Exception):
+            group_analyses = [group_analyses] * len(group)
+        ai_by_headline.update(zip(group, group_analyses))
+    if isinstance(similar_results, Exception):
+        similar_by_headline = dict.fromkeys(headlines, similar_results)
+    else:
+        similar_by_headline = dict(zip(headlines, similar_results or []))
+    if isinstance(reactions, Exception):
+        reactions = dict.fromkeys((i for i, _, _ in reaction_events), reactions)
+
+    # One timestamp for the whole batch
+    assessment_timestamp = _assessment_timestamp()
+    results = [None] * len(events)
+    assessed = []  # (index, assessment) of the events step 3 scores
+    factor_inputs = []
+    for i, (event, title) in enumerate(zip(events, titles)):
+        if title is None and i not in reactions:
+            results[i] = _unscorable(event)
+            continue
+        try:
+            assessment = _assess_stages(event, ai_by_headline.get(title), similar_by_headline.get(title),
+                                        reactions.get(i))
+            factor_inputs.append(_factor_inputs(event, assessment))
+            assessed.append((i, assessment))
+        except Exception as e:
+            results[i] = _critical_error(event, e)
+
+    # Step 3 for every assessed event in one batched kernel call
+    points = _factor_points_batch(factor_inputs)
+    for (i, assessment), event_points in zip(assessed, points):
+        event = events[i]
+        try:
+            scored = _score_from_points(*(int(p) for p in event_points))
+            results[i] = _compile_risk_result(event, assessment, scored, assessment_timestamp)
+        except Exception as e:
+            results[i] = _critical_error(event, e)
+    return results
+
+def _factor_inputs(event: Dict[str, Any], assessment: Dict[str, Any]) -> tuple:
+    """
+    An assessed event reduced to the kernel inputs compute_comprehensive_risk_score
+    would use, in factor_points_batch's argument order.
+    """
+    risk_assessment = assessment['risk_assessment']
+    reaction_result = assessment['reaction_result']
+    negative_found, positive_found, impact_found = _scan_title_or_empty(event.get('title'))
+    similar_stats = _similar_stats_for(assessment['similar_result'])
+    has_price = 'error' not in reaction_result
+    if has_price:
+        price_stats = risk_assessment.get('_price_stats') or _price_stats(reaction_result)
+        returns, ann_vol = price_stats['returns'], price_stats['ann_vol']
+    else:
+        returns, ann_vol = np.full(len(_REACTION_DAYS), np.nan), np.nan
+    return (len(negative_found), len(positive_found), similar_stats['negative'], len(impact_found),
+            similar_stats['high_impact'], len(risk_assessment.get('risk_factors', [])),
+            len(risk_assessment.get('similar_events', [])), returns, ann_vol, has_price)
+
+def _factor_points_batch(factor_inputs: List[tuple]) -> np.ndarray:
+    """factor_points_batch over the _factor_inputs of many events; an (n, 4) int64 array."""
+    if not factor_inputs:
+        return np.zeros((0, 4), dtype=np.int64)
+    columns = list(zip(*factor_inputs))
+    counts = [np.array(column, dtype=np.int64) for column in columns[:7]]
+    returns = np.array(columns[7], dtype=np.float64).reshape(len(factor_inputs), len(_REACTION_DAYS))
+    ann_vols = np.array(columns[8], dtype=np.float64)
+    has_price = np.array(columns[9], dtype=np.bool_)
+    return factor_points_batch(*counts, returns, ann_vols, has_price)
+
+def _run_sync(coroutine_function, *args):
+    """
+    Run coroutine_function(*args) to completion and return its result.
 
-        # Step 2: Compute market reaction metrics
-        if 'ticker' in event and 'date' in event and event['ticker'] and event['date']:
-            try:
-                print(f"Computing market reaction for {event['ticker']} on {event['date']}")
-
-                # Load price data
-                price_df = load_price_data("data/price_data.csv")
-
-                # Compute event reaction
-                reaction_result = compute_event_reaction(
-                    price_df=price_df,
-                    ticker=event['ticker'],
-                    event_date=event['date']
-                )
-
-                if 'error' not in reaction_result:
-                    risk_assessment['market_reaction'] = reaction_result
-
-                    # Analyze market reaction for risk
-                    returns_to_analyze = []
-                    for days in [1, 3, 5]:
-                        return_key = f'{days}_day_return'
-                        if return_key in reaction_result and reaction_result[return_key] is not None:
-                            returns_to_analyze.append(reaction_result[return_key])
-
-                    if returns_to_analyze:
-                        avg_return = sum(returns_to_analyze) / len(returns_to_analyze)
-                        max_negative_return = min(returns_to_analyze) if returns_to_analyze else 0
-
-                        # Risk scoring based on returns
-                        if avg_return < -0.05:  # Average return worse than -5%
-                            risk_assessment['risk_factors'].append(f"Severe negative market reaction: {avg_return:.2f}")
-                            risk_assessment['risk_score'] += 0.3
-                        elif avg_return < -0.02:  # Average return worse than -2%
-                            risk_assessment['risk_factors'].append(f"Moderate negative market reaction: {avg_return:.2f}")
-                            risk_assessment['risk_score'] += 0.15
-
-                        if max_negative_return < -0.10:  # Any single day drop > 10%
-                            risk_assessment['risk_factors'].append(f"Extreme single-day drop: {max_negative_return:.2f}")
-                            risk_assessment['risk_score'] += 0.25
-
-                    # Check volatility
-                    vol_data = reaction_result.get('volatility_20_day', {})
-                    if 'annualized_volatility' in vol_data:
-                        ann_vol = vol_data['annualized_volatility']
-                        if ann_vol > 0.5:  # Very high volatility
-                            risk_assessment['risk_factors'].append(f"Very high market volatility: {ann_vol:.2f}")
-                            risk_assessment['risk_score'] += 0.2
-                        elif ann_vol > 0.3:  # High volatility
-                            risk_assessment['risk_factors'].append(f"High market volatility: {ann_vol:.2f}")
-                            risk_assessment['risk_score'] += 0.1
-
-                    print("Market reaction analysis completed")
-                else:
-                    risk_assessment['risk_factors'].append(f"Market reaction analysis failed: {reaction_result.get('error', 'Unknown error')}")
-                    print(f"Warning: {reaction_result.get('error', 'Unknown error in market reaction analysis')}")
+    asyncio.run cannot start a loop in a thread that is already running one, so
+    in that case the coroutine runs under asyncio.run on a worker thread, and
+    this call blocks until it is done.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine_function(*args))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(coroutine_function(*args))).result()
+
+def _critical_error(event: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """Result for an event whose scoring failed outright."""
+    logger.error("Critical error in risk scoring: %s", error)
+    return _error_result(event, str(error))
+
+def _unscorable(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Result for an event with neither a title nor a ticker and date, so no stage can run."""
+    logger.warning("Skipping event: %s", _NOTHING_TO_SCORE)
+    return _error_result(event, _NOTHING_TO_SCORE)
+
+def _error_result(event: Dict[str, Any], message: str) -> Dict[str, Any]:
+    return {
+        'status': 'error',
+        'error': message,
+        'event_title': event.get('title', ''),
+        'risk_score': 0.0,
+        'risk_level': 'UNKNOWN'
+    }
 
-            except Exception as e:
-                risk_assessment['risk_factors'].append(f"Error computing market reaction: {str(e)}")
-                print(f"Error in market reaction analysis: {e}")
-        else:
-            risk_assessment['risk_factors'].append("Missing ticker or date for market reaction analysis")
-
-        # Step 2.5: Integrate Mistral AI analysis into risk assessment
-        if ai_analysis.get('status') == 'success' and ai_analysis.get('analysis'):
-            mistral_data = ai_analysis['analysis']
-            mistral_sentiment = mistral_data.get('sentiment', '').lower()
-
-            # Enhance risk scoring with AI insights
-            if mistral_sentiment == 'negative':
-                risk_assessment['risk_score'] += 0.2
-                risk_assessment['risk_factors'].append("AI-detected negative sentiment")
-            elif mistral_sentiment == 'positive':
-                risk_assessment['risk_score'] -= 0.1  # Reduce risk for positive sentiment
-                risk_assessment['risk_factors'].append("AI-detected positive sentiment")
-
-            # Extract ticker from AI analysis if not provided by user
-            if not risk_assessment.get('event_ticker') and mistral_data.get('ticker'):
-                risk_assessment['event_ticker'] = mistral_data['ticker']
-
-            # Add AI insights to recommendations
-            if 'recommendations' not in risk_assessment:
-                risk_assessment['recommendations'] = []
-
-            if mistral_data.get('summary'):
-                risk_assessment['recommendations'].append(f"AI Analysis: {mistral_data['summary']}")
-
-        # Step 3: Generate comprehensive risk score (0-100) and level
-        final_risk_score, risk_level, reasoning = compute_comprehensive_risk_score(
-            event, risk_assessment, similar_result, reaction_result
-        )
+def _assessment_timestamp() -> str:
+    """Current UTC time in ISO 8601 with a Z suffix, to the second."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+async def _skipped() -> None:
+    """Placeholder result for a stage whose inputs are missing."""
+    return None
 
-        # Step 4: Generate recommendations based on risk level
-        recommendations = generate_risk_recommendations(risk_level, final_risk_score)
-
-        # Step 5: Compile final result
-        result = {
-            'risk_score': final_risk_score,  # 0-100 scale
-            'risk_level': risk_level,  # Low, Medium, High
-            'reasoning': reasoning,
-            'raw_metrics': {
-                'event_title': event.get('title', ''),
-                'event_ticker': event.get('ticker', ''),
-                'event_date': event.get('date', ''),
-                'similar_events_count': len(risk_assessment.get('similar_events', [])),
-                'market_reaction': risk_assessment.get('market_reaction', {}),
-                'sentiment_impact_analysis': extract_sentiment_impact_analysis(event, similar_result),
-                'ai_event_analysis': ai_analysis.get('analysis', {}),
-                'price_reaction_metrics': extract_price_reaction_metrics(reaction_result)
-            },
-            'recommendations': recommendations,
-            'assessment_timestamp': '2024-01-17T16:23:17Z',  # Would be datetime.now() in real implementation
-            'status': 'success'
-        }
-
-        print(f"Final risk score: {final_risk_score}/100 ({risk_level})")
-        return result
+_NOTHING_TO_SCORE = "missing title, and no ticker and date to analyze instead"
+
+# Upper bound on concurrent analyze_events calls in score_events_batch
+_MAX_CONCURRENT_ANALYSES = 4
+
+_PRICE_DATA_PATH = "data/price_data.csv"
+
+@functools.lru_cache(maxsize=1)
+def _get_price_store(csv_file_path: str, mtime: float) -> PriceStore:
+    """Price data indexed by ticker, loaded once per file version (mtime is part of the cache key)."""
+    return PriceStore.from_csv(csv_file_path)
+
+def warm_up() -> Dict[str, bool]:
+    """
+    Load everything score_event_risk needs before the first event arrives.
 
+    Loads the embedding model and the event table, the price data, and
+    the on-disk analysis cache, and compiles the scoring kernels. They
+    are all process-wide singletons, so a long-running caller such as
+    the dashboard can call this once at startup.
+
+    Returns:
+        Dict[str, bool]: Per resource, whether it could be loaded
+    """
+    status = _warm_up_retrieval()
+    try:
+        _get_price_store(_PRICE_DATA_PATH, os.path.getmtime(_PRICE_DATA_PATH))
+        status['price_data'] = True
     except Exception as e:
-        print(f"Critical error in risk scoring: {e}")
-        return {
-            'status': 'error',
-            'error': str(e),
-            'event_title': event.get('title', ''),
-            'risk_score': 0.0,
-            'risk_level': 'UNKNOWN'
-        }
+        logger.warning("Could not load price data: %s", e)
+        status['price_data'] = False
+    status.update(_warm_up_understanding())
+
+    # Compiles the kernels (or loads them from numba's on-disk cache)
+    sentiment_kernel(0, 0, 0)
+    impact_kernel(0, 0)
+    similar_kernel(0, 0)
+    price_kernel(np.full(len(_REACTION_DAYS), np.nan), np.nan)
+    _factor_points_batch([(0, 0, 0, 0, 0, 0, 0, np.full(len(_REACTION_DAYS), np.nan), np.nan, False)])
+    return status
+
+def _compute_market_reaction(ticker: str, date: str) -> Dict[str, Any]:
+    """Compute the reaction to an event from the cached price data, in one worker thread."""
+    # Load price data; reloaded only when the file changes
+    price_store = _get_price_store(_PRICE_DATA_PATH, os.path.getmtime(_PRICE_DATA_PATH))
+
+    # Compute event reaction on the ticker's pre-sorted slice
+    return compute_event_reaction(
+        price_df=price_store,
+        ticker=ticker,
+        event_date=date
+    )
+
+def _build_risk_result(event: Dict[str, Any], ai_outcome: Any, similar_outcome: Any,
+                       reaction_outcome: Any, assessment_timestamp: str) -> Dict[str, Any]:
+    """
+    Combine the results of the three scoring stages into the final risk assessment.
+
+    Each outcome is the stage's return value, the exception it raised, or None if
+    its inputs were missing. assessment_timestamp is reported as is.
+
+    Raises:
+        Exception: If similar-event retrieval raised, which is a critical error
+    """
+    assessment = _assess_stages(event, ai_outcome, similar_outcome, reaction_outcome)
+
+    # Step 3: Generate comprehensive risk score (0-100) and level
+    scored = compute_comprehensive_risk_score(
+        event, assessment['risk_assessment'], assessment['similar_result'], assessment['reaction_result']
+    )
+    return _compile_risk_result(event, assessment, scored, assessment_timestamp)
+
+def _assess_stages(event: Dict[str, Any], ai_outcome: Any, similar_outcome: Any,
+                   reaction_outcome: Any) -> Dict[str, Any]:
+    """
+    Steps 0-2.5 of _build_risk_result: risk factors from the stage outcomes.
+
+    Returns:
+        Dict[str, Any]: 'risk_assessment', 'similar_result' (with its _similar_stats),
+            'reaction_result' and 'ai_analysis', as step 3 onwards read them
+
+    Raises:
+        Exception: If similar-event retrieval raised, which is a critical error
+    """
+    title, ticker, date = event.get('title', ''), event.get('ticker', ''), event.get('date', '')
+
+    # Initialize result variables
+    similar_result = {'status': 'error', 'similar_events': []}
+    reaction_result = {'error': 'No market reaction analysis performed'}
+
+    risk_assessment = {
+        'event_title': title,
+        'event_ticker': ticker,
+        'event_date': date,
+        'risk_score': 0.0,
+        'risk_factors': [],
+        'similar_events': [],
+        'market_reaction': {},
+        'recommendations': []
+    }
+
+    # Step 0: Analyze event with Mistral AI
+    ai_analysis = {'status': 'error', 'analysis': {}}
+    if title:
+        if isinstance(ai_outcome, Exception):
+            ai_analysis = {
+                'status': 'error',
+                'error': str(ai_outcome),
+                'analysis': {}
+            }
+            logger.warning("Mistral analysis failed: %s", ai_outcome)
+        else:
+            ai_analysis = {
+                'status': 'success',
+                'analysis': ai_outcome
+            }
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Mistral analysis complete: %s", ai_analysis['analysis'].get('sentiment', 'Unknown'))
+
+    # Step 1: Retrieve similar events using RAG
+    if title:
+        if isinstance(similar_outcome, Exception):
+            raise similar_outcome
+        similar_result = similar_outcome
+
+        if similar_result.get('status') == 'success':
+            risk_assessment['similar_events'] = similar_result.get('similar_events', [])
+
+            # Analyze similar events for risk patterns, counting them once for
+            # this step and the analyzers in step 3
+            similar_stats = _similar_stats(risk_assessment['similar_events'])
+            similar_result['_similar_stats'] = similar_stats
+            negative_events = similar_stats['negative']
+            high_impact_events = similar_stats['high_impact']
+
+            # Risk factor from similar events
+            if negative_events > 0:
+                risk_assessment['risk_factors'].append(f"Found {negative_events} similar negative events")
+                risk_assessment['risk_score'] += negative_events * 0.2
+
+            if high_impact_events > 0:
+                risk_assessment['risk_factors'].append(f"Found {high_impact_events} similar high-impact events")
+                risk_assessment['risk_score'] += high_impact_events * 0.15
+
+            logger.info("Found %d similar events", len(risk_assessment['similar_events']))
+        else:
+            risk_assessment['risk_factors'].append("Could not retrieve similar events")
+            logger.warning("%s", similar_result.get('error', 'Unknown error retrieving similar events'))
+    else:
+        risk_assessment['risk_factors'].append("No event title provided for similarity analysis")
+
+    # Step 2: Compute market reaction metrics
+    if ticker and date:
+        try:
+            if isinstance(reaction_outcome, Exception):
+                raise reaction_outcome
+            reaction_result = reaction_outcome
+
+            if 'error' not in reaction_result:
+                risk_assessment['market_reaction'] = reaction_result
+
+                # Analyze market reaction for risk, reading its figures once for
+                # this step and the price reaction factor in step 3
+                price_stats = _price_stats(reaction_result)
+                risk_assessment['_price_stats'] = price_stats
+                return_stats = price_stats['return_stats']
+                if return_stats is not None:
+                    avg_return, max_negative_return = return_stats
+
+                    # Risk scoring based on returns
+                    if avg_return < -0.05:  # Average return worse than -5%
+                        risk_assessment['risk_factors'].append(f"Severe negative market reaction: {avg_return:.2f}")
+                        risk_assessment['risk_score'] += 0.3
+                    elif avg_return < -0.02:  # Average return worse than -2%
+                        risk_assessment['risk_factors'].append(f"Moderate negative market reaction: {avg_return:.2f}")
+                        risk_assessment['risk_score'] += 0.15
+
+                    if max_negative_return < -0.10:  # Any single day drop > 10%
+                        risk_assessment['risk_factors'].append(f"Extreme single-day drop: {max_negative_return:.2f}")
+                        risk_assessment['risk_score'] += 0.25
+
+                # Check volatility (a missing volatility is NaN and passes neither check)
+                ann_vol = price_stats['ann_vol']
+                if ann_vol > 0.5:  # Very high volatility
+                    risk_assessment['risk_factors'].append(f"Very high market volatility: {ann_vol:.2f}")
+                    risk_assessment['risk_score'] += 0.2
+                elif ann_vol > 0.3:  # High volatility
+                    risk_assessment['risk_factors'].append(f"High market volatility: {ann_vol:.2f}")
+                    risk_assessment['risk_score'] += 0.1
+
+                logger.info("Market reaction analysis completed")
+            else:
+                risk_assessment['risk_factors'].append(f"Market reaction analysis failed: {reaction_result.get('error', 'Unknown error')}")
+                logger.warning("%s", reaction_result.get('error', 'Unknown error in market reaction analysis'))
+
+        except Exception as e:
+            risk_assessment['risk_factors'].append(f"Error computing market reaction: {str(e)}")
+            logger.warning("Error in market reaction analysis: %s", e)
+    else:
+        risk_assessment['risk_factors'].append("Missing ticker or date for market reaction analysis")
+
+    # Step 2.5: Integrate Mistral AI analysis into risk assessment
+    if ai_analysis.get('status') == 'success' and ai_analysis.get('analysis'):
+        mistral_data = ai_analysis['analysis']
+        mistral_sentiment = (mistral_data.get('sentiment') or '').lower()
+
+        # Enhance risk scoring with AI insights
+        if mistral_sentiment == 'negative':
+            risk_assessment['risk_score'] += 0.2
+            risk_assessment['risk_factors'].append("AI-detected negative sentiment")
+        elif mistral_sentiment == 'positive':
+            risk_assessment['risk_score'] -= 0.1  # Reduce risk for positive sentiment
+            risk_assessment['risk_factors'].append("AI-detected positive sentiment")
+
+        # Extract ticker from AI analysis if not provided by user
+        if not risk_assessment.get('event_ticker') and mistral_data.get('ticker'):
+            risk_assessment['event_ticker'] = mistral_data['ticker']
+
+        # Add AI insights to recommendations
+        if 'recommendations' not in risk_assessment:
+            risk_assessment['recommendations'] = []
+
+        if mistral_data.get('summary'):
+            risk_assessment['recommendations'].append(f"AI Analysis: {mistral_data['summary']}")
+
+    # Count negative/high-impact similar events once for all the analyzers in step 3
+    if '_similar_stats' not in similar_result:
+        similar_result['_similar_stats'] = _similar_stats(similar_result.get('similar_events', []))
+
+    return {
+        'risk_assessment': risk_assessment,
+        'similar_result': similar_result,
+        'reaction_result': reaction_result,
+        'ai_analysis': ai_analysis
+    }
+
+def _compile_risk_result(event: Dict[str, Any], assessment: Dict[str, Any], scored: tuple,
+                         assessment_timestamp: str) -> Dict[str, Any]:
+    """Steps 4-5 of _build_risk_result, given the (score, level, reasoning) of step 3."""
+    title, ticker, date = event.get('title', ''), event.get('ticker', ''), event.get('date', '')
+    risk_assessment = assessment['risk_assessment']
+    similar_result = assessment['similar_result']
+    reaction_result = assessment['reaction_result']
+    ai_analysis = assessment['ai_analysis']
+    final_risk_score, risk_level, reasoning = scored
+
+    # Step 4: Generate recommendations based on risk level
+    recommendations = generate_risk_recommendations(risk_level, final_risk_score)
+
+    # Step 5: Compile final result
+    result = {
+        'risk_score': final_risk_score,  # 0-100 scale
+        'risk_level': risk_level,  # Low, Medium, High
+        'reasoning': reasoning,
+        'raw_metrics': {
+            'event_title': title,
+            'event_ticker': ticker,
+            'event_date': date,
+            'similar_events_count': len(risk_assessment.get('similar_events', [])),
+            'market_reaction': risk_assessment.get('market_reaction', {}),
+            'sentiment_impact_analysis': extract_sentiment_impact_analysis(event, similar_result),
+            'ai_event_analysis': ai_analysis.get('analysis', {}),
+            'price_reaction_metrics': extract_price_reaction_metrics(reaction_result)
+        },
+        'recommendations': recommendations,
+        'assessment_timestamp': assessment_timestamp,
+        'status': 'success'
+    }
+
+    logger.info("Final risk score: %s/100 (%s)", final_risk_score, risk_level)
+    return result
 
 def compute_comprehensive_risk_score(event: Dict[str, Any], risk_assessment: Dict[str, Any],
                                    similar_result: Dict[str, Any], reaction_result: Dict[str, Any]) -> tuple:
     """
     Compute comprehensive risk score (0-100) combining all factors.
 
+    Returns:
+        tuple: (risk_score, risk_level, reasoning)
+    """
+    return _score_from_points(
+        # Factor 1: Sentiment Analysis (0-30 points)
+        analyze_sentiment_risk(event, similar_result),
+        # Factor 2: Impact Analysis (0-25 points)
+        analyze_impact_risk(event, similar_result),
+        # Factor 3: Similar Events Analysis (0-20 points)
+        analyze_similar_events_risk(risk_assessment),
+        # Factor 4: Price Reaction Analysis (0-25 points)
+        analyze_price_reaction_risk(reaction_result, risk_assessment.get('_price_stats'))
+    )
+
+def _score_from_points(sentiment_score: int, impact_score: int, similar_score: int, price_score: int) -> tuple:
+    """
+    Risk score, level and reasoning from the points of the four factors.
+
     Returns:
         tuple: (risk_score, risk_level, reasoning)
     """
     base_score = 0
     reasoning_parts = []
-
-    # Factor 1: Sentiment Analysis (0-30 points)
-    sentiment_score = analyze_sentiment_risk(event, similar_result)
-    base_score += sentiment_score
-    if sentiment_score > 0:
-        reasoning_parts.append(f"Sentiment analysis: {sentiment_score} points")
-
-    # Factor 2: Impact Analysis (0-25 points)
-    impact_score = analyze_impact_risk(event, similar_result)
-    base_score += impact_score
-    if impact_score > 0:
-        reasoning_parts.append(f"Impact analysis: {impact_score} points")
-
-    # Factor 3: Similar Events Analysis (0-20 points)
-    similar_score = analyze_similar_events_risk(risk_assessment)
-    base_score += similar_score
-    if similar_score > 0:
-        reasoning_parts.append(f"Similar events analysis: {similar_score} points")
-
-    # Factor 4: Price Reaction Analysis (0-25 points)
-    price_score = analyze_price_reaction_risk(reaction_result)
-    base_score += price_score
-    if price_score > 0:
-        reasoning_parts.append(f"Price reaction analysis: {price_score} points")
+    for label, points in (("Sentiment analysis", sentiment_score), ("Impact analysis", impact_score),
+                          ("Similar events analysis", similar_score), ("Price reaction analysis", price_score)):
+        base_score += points
+        if points > 0:
+            reasoning_parts.append(f"{label}: {points} points")
 
     # Ensure score is within 0-100 range
     final_score = max(0, min(100, base_score))
@@ -277,149 +812,96 @@ def compute_comprehensive_risk_score(event: Dict[str, Any], risk_assessment: Dic
 
     return final_score, risk_level, reasoning
 
-def analyze_sentiment_risk(event: Dict[str, Any], similar_result: Dict[str, Any]) -> float:
-    """Analyze sentiment-related risk (0-30 points)"""
-    score = 0
+def _similar_stats(similar_events: list) -> Dict[str, int]:
+    """
+    Count negative and high-impact events among similar events.
 
-    # Check event title for negative keywords
-    title = event.get('title', '').lower()
-    negative_keywords = ['faces', 'investigation', 'probe', 'recall', 'lawsuit', 'crisis', 'scandal',
-                        'violation', 'penalty', 'ban', 'shutdown', 'failure', 'breach']
-    positive_keywords = ['rally', 'surge', 'strong', 'positive', 'gains', 'success', 'breakthrough']
+    Sentiment and impact scores are gathered into float64 arrays once and
+    thresholded with vectorized comparisons.
 
-    negative_count = sum(1 for keyword in negative_keywords if keyword in title)
-    positive_count = sum(1 for keyword in positive_keywords if keyword in title)
+    Args:
+        similar_events (list): Similar events as returned by retrieve_similar_events
 
-    if negative_count > 0:
-        score += min(15, negative_count * 5)  # Up to 15 points for negative keywords
-    if positive_count > 0:
-        score -= min(5, positive_count * 2)  # Reduce score for positive keywords
+    Returns:
+        Dict[str, int]: 'count', 'negative' (sentiment < -0.3) and 'high_impact' (impact > 0.7)
+    """
+    count = len(similar_events)
+    sentiments = np.fromiter((e.get('sentiment_score', 0) for e in similar_events), dtype=np.float64, count=count)
+    impacts = np.fromiter((e.get('impact_score', 0) for e in similar_events), dtype=np.float64, count=count)
+    return {
+        'count': count,
+        'negative': int((sentiments < -0.3).sum()),
+        'high_impact': int((impacts > 0.7).sum()),
+    }
 
-    # Check similar events sentiment
-    similar_events = similar_result.get('similar_events', [])
-    if similar_events:
-        negative_similar = sum(1 for e in similar_events if e.get('sentiment_score', 0) < -0.3)
-        if negative_similar > 0:
-            score += min(15, negative_similar * 3)  # Up to 15 points for negative similar events
+def _similar_stats_for(similar_result: Dict[str, Any]) -> Dict[str, int]:
+    """Stats stored on similar_result by _build_risk_result, or computed for direct callers."""
+    stats = similar_result.get('_similar_stats')
+    if stats is None:
+        stats = _similar_stats(similar_result.get('similar_events', []))
+    return stats
 
-    return max(0, score)
+def analyze_sentiment_risk(event: Dict[str, Any], similar_result: Dict[str, Any]) -> float:
+    """Analyze sentiment-related risk (0-30 points)"""
+    negative_found, positive_found, _ = _scan_title_or_empty(event.get('title'))
+    negative_similar = _similar_stats_for(similar_result)['negative']
+    return sentiment_kernel(len(negative_found), len(positive_found), negative_similar)
 
 def analyze_impact_risk(event: Dict[str, Any], similar_result: Dict[str, Any]) -> float:
     """Analyze impact-related risk (0-25 points)"""
-    score = 0
-
-    # Check for high-impact keywords in title
-    title = event.get('title', '').lower()
-    high_impact_keywords = ['major', 'massive', 'significant', 'historic', 'unprecedented',
-                           'revolutionary', 'breakthrough', 'crisis', 'emergency']
-
-    impact_count = sum(1 for keyword in high_impact_keywords if keyword in title)
-    if impact_count > 0:
-        score += min(10, impact_count * 3)  # Up to 10 points for impact keywords
-
-    # Check similar events impact
-    similar_events = similar_result.get('similar_events', [])
-    if similar_events:
-        high_impact_similar = sum(1 for e in similar_events if e.get('impact_score', 0) > 0.7)
-        if high_impact_similar > 0:
-            score += min(15, high_impact_similar * 4)  # Up to 15 points for high-impact similar events
-
-    return max(0, score)
+    impact_count = len(_scan_title_or_empty(event.get('title'))[2])
+    high_impact_similar = _similar_stats_for(similar_result)['high_impact']
+    return impact_kernel(impact_count, high_impact_similar)
 
 def analyze_similar_events_risk(risk_assessment: Dict[str, Any]) -> float:
     """Analyze risk from similar events pattern (0-20 points)"""
-    score = 0
-
-    risk_factors = risk_assessment.get('risk_factors', [])
-    similar_events = risk_assessment.get('similar_events', [])
+    return similar_kernel(len(risk_assessment.get('risk_factors', [])),
+                          len(risk_assessment.get('similar_events', [])))
 
-    # Points for each risk factor identified
-    score += len(risk_factors) * 2  # Up to 10 points for risk factors
-
-    # Points for number of similar events found
-    similar_count = len(similar_events)
-    if similar_count > 3:
-        score += 10  # 10 points if many similar events
-    elif similar_count > 1:
-        score += 5   # 5 points if some similar events
+def _price_stats(reaction_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return and volatility figures of a successful market reaction, read once for
+    the step 2 risk factors and analyze_price_reaction_risk.
 
-    return min(20, score)
+    Args:
+        reaction_result (Dict[str, Any]): Result of compute_event_reaction
 
-def analyze_price_reaction_risk(reaction_result: Dict[str, Any]) -> float:
-    """Analyze risk from price reaction metrics (0-25 points)"""
-    score = 0
+    Returns:
+        Dict[str, Any]: 'returns' (float64 1/3/5-day returns, NaN where missing),
+            'return_stats' ((average, worst) of the available returns, or None)
+            and 'ann_vol' (annualized 20-day volatility, NaN if missing)
+    """
+    returns = [reaction_result.get(f'{days}_day_return') for days in _REACTION_DAYS]
+    available = [value for value in returns if value is not None]
+    vol_data = reaction_result.get('volatility_20_day', {})
+    return {
+        'returns': np.array([np.nan if value is None else value for value in returns], dtype=np.float64),
+        'return_stats': (sum(available) / len(available), min(available)) if available else None,
+        'ann_vol': float(vol_data['annualized_volatility']) if 'annualized_volatility' in vol_data else np.nan,
+    }
 
+def analyze_price_reaction_risk(reaction_result: Dict[str, Any],
+                                price_stats: Optional[Dict[str, Any]] = None) -> float:
+    """Analyze risk from price reaction metrics (0-25 points); price_stats is _price_stats(reaction_result) if known"""
     if 'error' in reaction_result:
         return 0  # No price data available
-
-    # Check return metrics
-    returns_to_check = []
-    for days in [1, 3, 5]:
-        return_key = f'{days}_day_return'
-        if return_key in reaction_result and reaction_result[return_key] is not None:
-            returns_to_check.append(reaction_result[return_key])
-
-    if returns_to_check:
-        # Penalize for negative returns
-        avg_return = sum(returns_to_check) / len(returns_to_check)
-        if avg_return < -0.05:  # Worse than -5%
-            score += 15
-        elif avg_return < -0.02:  # Worse than -2%
-            score += 8
-
-        # Check for extreme single-day moves
-        max_negative = min(returns_to_check) if returns_to_check else 0
-        if max_negative < -0.10:  # Any single day drop > 10%
-            score += 10
-
-    # Check volatility
-    vol_data = reaction_result.get('volatility_20_day', {})
-    if 'annualized_volatility' in vol_data:
-        ann_vol = vol_data['annualized_volatility']
-        if ann_vol > 0.5:  # Very high volatility
-            score += 10
-        elif ann_vol > 0.3:  # High volatility
-            score += 5
-
-    return min(25, score)
+    if price_stats is None:
+        price_stats = _price_stats(reaction_result)
+    return price_kernel(price_stats['returns'], price_stats['ann_vol'])
 
 def generate_risk_recommendations(risk_level: str, risk_score: float) -> list:
     """Generate risk-appropriate recommendations"""
-    if risk_level == "High":
-        return [
-            "[HIGH RISK] IMMEDIATE ATTENTION REQUIRED",
-            "Consider immediate position adjustments or hedging",
-            "Monitor news feeds and social media closely",
-            "Prepare contingency plans for further developments",
-            "Consult with risk management team immediately"
-        ]
-    elif risk_level == "Medium":
-        return [
-            "[MEDIUM RISK] INCREASED MONITORING RECOMMENDED",
-            "Review and potentially adjust position sizing",
-            "Stay informed about related news developments",
-            "Consider setting additional stop-loss levels",
-            "Monitor competitor reactions and market sentiment"
-        ]
-    else:  # Low
-        return [
-            "[LOW RISK] NORMAL MONITORING PROCEDURES",
-            "Continue standard market monitoring",
-            "Note event for regular portfolio review",
-            "No immediate action required",
-            "Maintain existing risk management protocols"
-        ]
+    return list(_RECOMMENDATIONS.get(risk_level, _RECOMMENDATIONS["Low"]))
 
 def extract_sentiment_impact_analysis(event: Dict[str, Any], similar_result: Dict[str, Any]) -> dict:
     """Extract sentiment and impact analysis details"""
+    stats = _similar_stats_for(similar_result)
     return {
         'event_title': event.get('title', ''),
         'sentiment_keywords_found': extract_sentiment_keywords(event.get('title', '')),
-        'similar_events_count': len(similar_result.get('similar_events', [])),
-        'negative_similar_events': sum(1 for e in similar_result.get('similar_events', [])
-                                     if e.get('sentiment_score', 0) < -0.3),
-        'high_impact_similar_events': sum(1 for e in similar_result.get('similar_events', [])
-                                        if e.get('impact_score', 0) > 0.7)
+        'similar_events_count': stats['count'],
+        'negative_similar_events': stats['negative'],
+        'high_impact_similar_events': stats['high_impact']
     }
 
 def extract_price_reaction_metrics(reaction_result: Dict[str, Any]) -> dict:
@@ -434,7 +916,7 @@ def extract_price_reaction_metrics(reaction_result: Dict[str, Any]) -> dict:
     }
 
     # Extract returns
-    for days in [1, 3, 5]:
+    for days in _REACTION_DAYS:
         return_key = f'{days}_day_return'
         price_key = f'{days}_day_price'
         date_key = f'{days}_day_date'
@@ -450,19 +932,5 @@ def extract_price_reaction_metrics(reaction_result: Dict[str, Any]) -> dict:
 
 def extract_sentiment_keywords(title: str) -> list:
     """Extract sentiment-related keywords from title"""
-    title_lower = title.lower()
-    keywords = []
-
-    negative_keywords = ['faces', 'investigation', 'probe', 'recall', 'lawsuit', 'crisis', 'scandal',
-                        'violation', 'penalty', 'ban', 'shutdown', 'failure', 'breach']
-    positive_keywords = ['rally', 'surge', 'strong', 'positive', 'gains', 'success', 'breakthrough']
-
-    for keyword in negative_keywords:
-        if keyword in title_lower:
-            keywords.append(f"negative: {keyword}")
-
-    for keyword in positive_keywords:
-        if keyword in title_lower:
-            keywords.append(f"positive: {keyword}")
-
-    return keywords
\ No newline at end of file
+    negative_found, positive_found, _ = _scan_title_or_empty(title)
+    return [f"negative: {keyword}" for keyword in negative_found] + [f"positive: {keyword}" for keyword in positive_found]
\ No newline at end of file
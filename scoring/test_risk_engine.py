@@ -1,14 +1,19 @@
 """
 Test script for risk scoring functionality.
+
+Run from the repository root with `python -m scoring.test_risk_engine` or `python -m pytest`.
 """
 
-import sys
-import os
+import asyncio
+import logging
+import tempfile
 
-# Add parent directory to path to allow importing from sibling modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
 
-from scoring.risk_engine import score_event_risk
+from rag import context_retrieval
+from rag.context_retrieval import build_event_index, retrieve_similar_events
+from scoring import risk_engine
+from scoring.risk_engine import ProximityCache, score_event_risk, score_events_batch
 
 def test_score_event_risk():
     """
@@ -120,8 +125,248 @@ def test_score_event_risk_missing_data():
         print(f"ERROR: Failed to handle incomplete data: {e}")
         return False
 
+def test_scan_title():
+    """
+    Test the title keyword scan: substring matches in list order, and no keyword a prefix of another.
+    """
+    print("\nTesting title keyword scan...")
+    print("=" * 50)
+
+    keywords = set(risk_engine._NEGATIVE_KEYWORDS + risk_engine._POSITIVE_KEYWORDS + risk_engine._HIGH_IMPACT_KEYWORDS)
+    prefixes = sorted((short, long) for short in keywords for long in keywords
+                      if short != long and long.startswith(short))
+    print(f"Keywords that are prefixes of others: {prefixes}")
+    if prefixes:
+        print("ERROR: A keyword is a prefix of another")
+        return False
+
+    cases = {
+        'Bank faces probe after CRISISBREACH': (('faces', 'probe', 'crisis', 'ban', 'breach'), (), ('crisis',)),
+        'Stronger rally and massive Breakthrough': ((), ('rally', 'strong', 'breakthrough'), ('massive', 'breakthrough')),
+        'Quarterly results in line': ((), (), ()),
+    }
+    scans = {title: risk_engine._scan_title(title) for title in cases}
+    for title, scan in scans.items():
+        print(f"{title}: {scan}")
+    if scans != cases:
+        print("ERROR: Title scan did not find the expected keywords")
+        return False
+
+    print("\nSUCCESS: Title keyword scan behaved as expected!")
+    return True
+
+def test_proximity_cache():
+    """
+    Test approximate hits, misses and least-recently-used eviction in ProximityCache.
+    """
+    print("\nTesting proximity cache...")
+    print("=" * 50)
+
+    def unit(*values):
+        vector = np.array(values, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    cache = ProximityCache(capacity=2, tau=0.05)
+    cache.put(unit(1, 0, 0), "x")
+    cache.put(unit(0, 1, 0), "y")
+
+    near_x = cache.get(unit(1, 0.1, 0))  # cosine distance ~0.005
+    far = cache.get(unit(1, 1, 0))       # cosine distance ~0.29 to both keys
+    print(f"Near hit: {near_x}, far lookup: {far}")
+    if near_x != "x" or far is not None:
+        print("ERROR: Lookups did not respect the distance threshold")
+        return False
+
+    # "x" was used more recently than "y", so "y" is evicted
+    cache.put(unit(0, 0, 1), "z")
+    remaining = [cache.get(unit(1, 0, 0)), cache.get(unit(0, 1, 0)), cache.get(unit(0, 0, 1))]
+    print(f"After eviction: {remaining}")
+    if remaining != ["x", None, "z"]:
+        print("ERROR: Least recently used entry was not the one evicted")
+        return False
+
+    # A cleared cache is empty, and fills again like a new one
+    cache.clear()
+    after_clear = cache.get(unit(1, 0, 0))
+    cache.put(unit(0, 1, 0), "y")
+    refilled = [cache.get(unit(0, 1, 0)), cache.get(unit(0, 0, 1))]
+    print(f"After clear: {after_clear}, refilled: {refilled}")
+    if after_clear is not None or refilled != ["y", None] or cache._clock != 2 or cache._last_used.max() != 2:
+        print("ERROR: clear did not reset the cache")
+        return False
+
+    print("\nSUCCESS: Proximity cache behaved as expected!")
+    return True
+
+def test_similar_events_cache_rebuild():
+    """
+    Test that rebuilding the event index empties the similar-events cache.
+    """
+    print("\nTesting similar-events cache after an index rebuild...")
+    print("=" * 55)
+
+    headline = 'Apple announces major product recall'
+    retrievals = []
+
+    def counting_retrieve(**kwargs):
+        retrievals.append(kwargs['headline'])
+        return retrieve_similar_events(**kwargs)
+
+    def use_store(path):
+        context_retrieval._LANCEDB_PATH = path
+        for cached in (context_retrieval._get_db, context_retrieval._get_table, context_retrieval._get_memory_index):
+            cached.cache_clear()
+
+    # Index into a scratch store, so the real market_events table is left alone;
+    # earlier tests may have cached this headline already
+    saved_path = context_retrieval._LANCEDB_PATH
+    risk_engine._similar_events_cache.clear()
+    risk_engine.retrieve_similar_events = counting_retrieve
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        use_store(tmp_dir)
+        try:
+            build_event_index(force=True)
+            risk_engine._retrieve_similar_events_cached(headline)
+            risk_engine._retrieve_similar_events_cached(headline)
+            before_rebuild = len(retrievals)
+
+            rebuilt = build_event_index(force=True)
+            risk_engine._retrieve_similar_events_cached(headline)
+            after_rebuild = len(retrievals)
+        except Exception as e:
+            print(f"ERROR: Failed to test the similar-events cache: {e}")
+            return False
+        finally:
+            use_store(saved_path)
+            risk_engine.retrieve_similar_events = retrieve_similar_events
+            risk_engine._similar_events_cache.clear()
+
+    print(f"Rebuild: {rebuilt.get('status')}; retrievals before rebuild: {before_rebuild}, after: {after_rebuild}")
+    if rebuilt.get('status') != 'success' or before_rebuild != 1 or after_rebuild != 2:
+        print("ERROR: The similar-events cache answered from before the rebuild")
+        return False
+
+    print("\nSUCCESS: Rebuilding the index emptied the similar-events cache!")
+    return True
+
+def test_factor_points_batch():
+    """
+    Test that the batched kernel scores events as compute_comprehensive_risk_score does.
+    """
+    print("\nTesting factor_points_batch kernel...")
+    print("=" * 50)
+
+    similar = {'status': 'success', 'similar_events': [
+        {'sentiment_score': -0.5, 'impact_score': 0.8}, {'sentiment_score': 0.1, 'impact_score': 0.2},
+        {'sentiment_score': -0.4, 'impact_score': 0.9}, {'sentiment_score': 0.3, 'impact_score': 0.1},
+    ]}
+    # (event, similar-events outcome, market reaction outcome) per event
+    cases = [
+        ({'title': 'Apple faces probe amid massive recall', 'ticker': 'AAPL', 'date': '2024-01-17'}, similar,
+         {'1_day_return': -0.12, '3_day_return': -0.04, 'volatility_20_day': {'annualized_volatility': 0.6}}),
+        ({'title': 'Microsoft shares rally on strong gains', 'ticker': 'MSFT', 'date': '2024-01-17'}, similar,
+         {'1_day_return': 0.02, '5_day_return': 0.03}),
+        ({'title': 'Tesla lawsuit', 'ticker': 'TSLA', 'date': '2024-01-16'}, similar, {'error': 'No price data'}),
+        ({'title': 'Fed holds rates'}, {'status': 'error', 'error': 'unavailable'}, None),
+    ]
+
+    try:
+        single, factor_inputs = [], []
+        for event, similar_outcome, reaction_outcome in cases:
+            assessment = risk_engine._assess_stages(event, {'sentiment': 'Negative'}, similar_outcome, reaction_outcome)
+            single.append(risk_engine.compute_comprehensive_risk_score(
+                event, assessment['risk_assessment'], assessment['similar_result'], assessment['reaction_result']
+            ))
+            factor_inputs.append(risk_engine._factor_inputs(event, assessment))
+
+        points = risk_engine._factor_points_batch(factor_inputs)
+        batch = [risk_engine._score_from_points(*(int(p) for p in row)) for row in points]
+        print(f"Batch: {[score for score, _, _ in batch]}, single: {[score for score, _, _ in single]}")
+        if batch != single:
+            print("ERROR: Batched kernel scores differ from single-event scores")
+            return False
+
+        print("\nSUCCESS: Batched kernel scores match single-event results!")
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Failed to score with the batched kernel: {e}")
+        return False
+
+def test_score_events_batch():
+    """
+    Test that score_events_batch returns what score_event_risk does for each event.
+    """
+    print("\nTesting score_events_batch function...")
+    print("=" * 50)
+
+    events = [
+        {'title': 'Apple announces major product recall', 'ticker': 'AAPL', 'date': '2024-01-17'},
+        {'title': 'Tesla faces SEC investigation', 'ticker': 'TSLA', 'date': '2024-01-16'},
+        {'title': 'Apple announces major product recall', 'ticker': 'AAPL', 'date': '2024-01-17'},
+        {'title': '', 'ticker': 'ZZZZ', 'date': '2024-01-17'},
+    ]
+
+    try:
+        batch = score_events_batch(events)
+        single = [score_event_risk(event) for event in events]
+
+        print(f"Batch scores: {[(r.get('risk_score'), r.get('risk_level')) for r in batch]}")
+
+        # Batch results share one assessment timestamp; the single runs each take their own
+        def without_timestamp(results):
+            return [{k: v for k, v in r.items() if k != 'assessment_timestamp'} for r in results]
+
+        if len(batch) != len(events) or without_timestamp(batch) != without_timestamp(single):
+            print("ERROR: Batch results differ from single-event results")
+            return False
+
+        print("\nSUCCESS: Batch scoring matches single-event scoring!")
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Failed to score events batch: {e}")
+        return False
+
+def test_score_event_risk_in_running_loop():
+    """
+    Test that the synchronous scoring functions work when called from a running event loop.
+    """
+    print("\nTesting score_event_risk inside a running event loop...")
+    print("=" * 55)
+
+    event = {'title': 'Tesla faces SEC investigation', 'ticker': 'TSLA', 'date': '2024-01-16'}
+
+    async def score_in_loop():
+        return score_event_risk(dict(event)), score_events_batch([dict(event)])
+
+    try:
+        in_loop, in_loop_batch = asyncio.run(score_in_loop())
+        outside = score_event_risk(dict(event))
+
+        def without_timestamp(result):
+            return {k: v for k, v in result.items() if k != 'assessment_timestamp'}
+
+        print(f"In loop: {in_loop.get('status')} {in_loop.get('risk_score')}, outside: {outside.get('risk_score')}")
+        if in_loop.get('status') != 'success' or without_timestamp(in_loop) != without_timestamp(outside):
+            print("ERROR: Scoring inside a running loop differs from scoring outside one")
+            return False
+        if len(in_loop_batch) != 1 or without_timestamp(in_loop_batch[0]) != without_timestamp(outside):
+            print("ERROR: Batch scoring inside a running loop differs from scoring outside one")
+            return False
+
+        print("\nSUCCESS: Scoring works inside a running event loop!")
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Failed to score inside a running event loop: {e}")
+        return False
+
 def main():
     """Run all risk scoring tests"""
+    # Show the risk engine's progress messages alongside the test output
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     print("Running Risk Scoring Module tests...\n")
 
     # Test with complete event data
@@ -130,12 +375,36 @@ def main():
     # Test with incomplete event data
     success2 = test_score_event_risk_missing_data()
 
+    # Test the similar-events cache
+    success3 = test_proximity_cache()
+
+    # Test the title keyword scan
+    success4 = test_scan_title()
+
+    # Test batch scoring against single-event scoring
+    success5 = test_score_events_batch()
+
+    # Test the batched kernel against single-event scoring
+    success6 = test_factor_points_batch()
+
+    # Test the synchronous entry points from inside a running event loop
+    success7 = test_score_event_risk_in_running_loop()
+
+    # Test that an index rebuild empties the similar-events cache
+    success8 = test_similar_events_cache_rebuild()
+
     print("\n" + "=" * 50)
     print("Risk Scoring Test Summary:")
     print(f"Complete event analysis: {'PASS' if success1 else 'FAIL'}")
     print(f"Incomplete data handling: {'PASS' if success2 else 'FAIL'}")
+    print(f"Proximity cache: {'PASS' if success3 else 'FAIL'}")
+    print(f"Title keyword scan: {'PASS' if success4 else 'FAIL'}")
+    print(f"Batch event scoring: {'PASS' if success5 else 'FAIL'}")
+    print(f"Batched factor kernel: {'PASS' if success6 else 'FAIL'}")
+    print(f"Scoring in a running loop: {'PASS' if success7 else 'FAIL'}")
+    print(f"Similar-events cache after rebuild: {'PASS' if success8 else 'FAIL'}")
 
-    if success1 and success2:
+    if success1 and success2 and success3 and success4 and success5 and success6 and success7 and success8:
         print("SUCCESS: All risk scoring tests passed!")
     else:
         print("FAILURE: Some tests failed!")
@@ -6,17 +6,24 @@ A Streamlit application for analyzing market event risks using AI and analytics.
 import streamlit as st
 import sys
 import os
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
+import bisect
+import collections
+import time
+import numpy as np
+import json
+from datetime import datetime
+
+# orjson serializes the raw-data view faster when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path to allow importing from sibling modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scoring.risk_engine import score_event_risk
-from analytics.historical_analytics import load_price_data
-from rag.context_retrieval import retrieve_similar_events
+# Plotly and the scoring pipeline (embedding model, LanceDB, DuckDB) are imported
+# where first used, so the page renders before they load
 
 # Page configuration
 st.set_page_config(
@@ -53,43 +60,149 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+class _Uncacheable(Exception):
+    """Raised inside _cached_score so st.cache_data does not store failed or incomplete assessments."""
+
+    def __init__(self, result):
+        super().__init__(result.get('error'))
+        self.result = result
+
+# Seconds a complete assessment is reused, across sessions and within one
+_SCORE_TTL = 3600
+
+# Latest assessments kept in each session's result_cache
+_SESSION_RESULTS_MAX = 32
+
+@st.cache_data(ttl=_SCORE_TTL, show_spinner=False)
+def _cached_score(title, ticker, date_str):
+    """score_event_risk for the form inputs, cached for an hour per (title, ticker, date)."""
+    from scoring.risk_engine import score_event_risk
+
+    result = score_event_risk({
+        'title': title,
+        'ticker': ticker,
+        'date': date_str,
+        'description': f"Analysis of {title} for {ticker}"
+    })
+    if not _is_complete(result):
+        raise _Uncacheable(result)
+    return result
+
+def _is_complete(result):
+    """
+    Whether an assessment succeeded with an AI event analysis.
+
+    Only those are cached: one scored while Ollama was unavailable must not
+    be served once it is back.
+    """
+    if result.get('status') != 'success':
+        return False
+    ai_data = (result.get('raw_metrics') or {}).get('ai_event_analysis') or {}
+    return bool(ai_data.get('sentiment'))
+
+def score_form_event(title, ticker, date_str):
+    """Risk assessment for the form inputs; only complete assessments are cached."""
+    try:
+        return _cached_score(title, ticker, date_str)
+    except _Uncacheable as e:
+        return e.result
+
+def _session_result(key):
+    """
+    Assessment this session already made for the form inputs, or None.
+
+    result_cache maps (title, ticker, date) to (time stored, assessment), least
+    recently used first. It holds the last _SESSION_RESULTS_MAX inputs, and
+    entries older than _SCORE_TTL are dropped like those of _cached_score.
+    """
+    session_results = st.session_state.setdefault('result_cache', collections.OrderedDict())
+    entry = session_results.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > _SCORE_TTL:
+        del session_results[key]
+        return None
+    session_results.move_to_end(key)
+    return result
+
+def _remember_session_result(key, result):
+    """Keep a complete assessment in result_cache, evicting the least recently used."""
+    session_results = st.session_state.setdefault('result_cache', collections.OrderedDict())
+    session_results[key] = (time.monotonic(), result)
+    session_results.move_to_end(key)
+    while len(session_results) > _SESSION_RESULTS_MAX:
+        session_results.popitem(last=False)
+
+@st.cache_resource(ttl=60, show_spinner=False)
+def _ollama_ready():
+    """Whether the Ollama API answers, probed at most once a minute across sessions."""
+    import requests
+
+    try:
+        return requests.get("http://localhost:11434/api/tags", timeout=2).status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+@st.cache_resource(show_spinner="Loading models and data...")
+def _warm_up_pipeline():
+    """Load the embedding model, event table, price data and scoring kernels once per server process."""
+    from scoring.risk_engine import warm_up
+
+    return warm_up()
+
+def _to_json(data):
+    """Indented JSON text of an assessment, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(data, indent=2, default=str)
+
+# Charts are static readouts: no mode bar, resized with the page
+_PLOTLY_CONFIG = {'displayModeBar': False, 'responsive': True}
+
+# Gauge bar color and label per risk level; bisect_right over the level
+# boundaries picks the entry, so a score of exactly 40 or 70 is the higher level
+_GAUGE_LEVEL_BOUNDS = (40, 70)
+_GAUGE_LEVEL_STYLES = (("green", "LOW RISK"), ("orange", "MEDIUM RISK"), ("red", "HIGH RISK"))
+
+# Parts of the gauge that do not depend on the score, shared by every figure
+_GAUGE_AXIS = {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "darkblue"}
+_GAUGE_STEPS = [
+    {'range': [0, 40], 'color': 'lightgreen'},
+    {'range': [40, 70], 'color': 'lightyellow'},
+    {'range': [70, 100], 'color': 'lightcoral'}
+]
+_GAUGE_THRESHOLD_LINE = {'color': "red", 'width': 4}
+
+@st.cache_data(max_entries=128, show_spinner=False)
 def create_risk_gauge(risk_score):
-    """Create a gauge chart for risk score visualization"""
-    if risk_score >= 70:
-        color = "red"
-        label = "HIGH RISK"
-    elif risk_score >= 40:
-        color = "orange"
-        label = "MEDIUM RISK"
-    else:
-        color = "green"
-        label = "LOW RISK"
-
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=risk_score,
-        title={'text': f"Risk Score ({label})", 'font': {'size': 20}},
-        gauge={
-            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+    """Create a gauge chart for risk score visualization (cached per score)"""
+    import plotly.graph_objects as go
+
+    color, label = _GAUGE_LEVEL_STYLES[bisect.bisect_right(_GAUGE_LEVEL_BOUNDS, risk_score)]
+
+    # Trace and layout as plain dicts, so the figure is built and validated once
+    indicator = {
+        'type': "indicator",
+        'mode': "gauge+number",
+        'value': risk_score,
+        'title': {'text': f"Risk Score ({label})", 'font': {'size': 20}},
+        'gauge': {
+            'axis': _GAUGE_AXIS,
             'bar': {'color': color},
             'bgcolor': "white",
             'borderwidth': 2,
             'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 40], 'color': 'lightgreen'},
-                {'range': [40, 70], 'color': 'lightyellow'},
-                {'range': [70, 100], 'color': 'lightcoral'}
-            ],
+            'steps': _GAUGE_STEPS,
             'threshold': {
-                'line': {'color': "red", 'width': 4},
+                'line': _GAUGE_THRESHOLD_LINE,
                 'thickness': 0.75,
                 'value': risk_score
             }
         }
-    ))
+    }
 
-    fig.update_layout(height=300)
-    return fig
+    return go.Figure(data=[indicator], layout={'height': 300})
 
 def create_returns_chart(market_reaction):
     """Create a chart showing price returns over time"""
@@ -98,25 +211,29 @@ def create_returns_chart(market_reaction):
 
     returns_data = market_reaction.get('returns', {})
 
-    if not returns_data:
+    # Only the (period, return) pairs matter for the chart, and they key its cache
+    pairs = tuple(
+        (period, data['return']) for period, data in returns_data.items()
+        if data.get('return') is not None
+    )
+    if not pairs:
         return None
 
-    # Prepare data for plotting
-    periods = []
-    returns = []
+    return _build_returns_fig(pairs)
 
-    for period, data in returns_data.items():
-        if data.get('return') is not None:
-            periods.append(period.replace('_', '-').title())
-            returns.append(data['return'] * 100)  # Convert to percentage
+@st.cache_data(max_entries=128, show_spinner=False)
+def _build_returns_fig(pairs):
+    """Bar chart of (period, return) pairs, cached per distinct pairs."""
+    import plotly.graph_objects as go
 
-    if not periods:
-        return None
+    # Prepare data for plotting
+    periods = [period.replace('_', '-').title() for period, _ in pairs]
+    returns = np.fromiter((value for _, value in pairs), dtype=np.float64, count=len(pairs)) * 100  # Convert to percentage
 
     fig = go.Figure()
 
     # Add bars for returns
-    colors = ['green' if r >= 0 else 'red' for r in returns]
+    colors = np.where(returns >= 0, 'green', 'red').tolist()
     fig.add_trace(go.Bar(
         x=periods,
         y=returns,
@@ -139,20 +256,185 @@ def display_similar_events(similar_events):
         st.info("No similar events found")
         return
 
-    # Create a dataframe for display
-    events_data = []
+    # Columns for display; st.dataframe takes the dict of lists as is
+    ranks, titles, similarities, sentiments, impacts, sources = [], [], [], [], [], []
     for event in similar_events[:5]:  # Show top 5
-        events_data.append({
-            "Rank": event.get('rank', 'N/A'),
-            "Title": event.get('title', 'N/A')[:50] + "..." if len(event.get('title', '')) > 50 else event.get('title', 'N/A'),
-            "Similarity": f"{event.get('similarity_score', 0):.3f}",
-            "Sentiment": event.get('sentiment_score', 'N/A'),
-            "Impact": event.get('impact_score', 'N/A'),
-            "Source": event.get('source', 'N/A')
-        })
-
-    df = pd.DataFrame(events_data)
-    st.dataframe(df, use_container_width=True)
+        get = event.get
+        title = get('title') or 'N/A'
+        ranks.append(get('rank', 'N/A'))
+        titles.append(title[:50] + "..." if len(title) > 50 else title)
+        similarities.append(f"{get('similarity_score', 0):.3f}")
+        sentiments.append(get('sentiment_score', 'N/A'))
+        impacts.append(get('impact_score', 'N/A'))
+        sources.append(get('source', 'N/A'))
+
+    st.dataframe({
+        "Rank": ranks,
+        "Title": titles,
+        "Similarity": similarities,
+        "Sentiment": sentiments,
+        "Impact": impacts,
+        "Source": sources
+    }, use_container_width=True)
+
+@st.fragment
+def render_results(result):
+    """
+    Render a risk assessment.
+
+    Runs as a fragment, so expanding sections or other interaction with the
+    results reruns only this function, not the form and the rest of the page.
+    """
+    if result.get('status') == 'success':
+        raw_metrics = result.get('raw_metrics') or {}
+        ai_data = raw_metrics.get('ai_event_analysis') or {}
+        market_reaction = raw_metrics.get('market_reaction') or {}
+        sentiment_analysis = raw_metrics.get('sentiment_impact_analysis') or {}
+        similar_count = raw_metrics.get('similar_events_count', 0)
+
+        # Risk Score Display
+        st.header("🎯 Risk Assessment Results")
+
+        # AI Event Analysis Section
+        if ai_data:
+            st.subheader("🤖 AI Event Analysis (Mistral)")
+
+            # AI Analysis Cards
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                event_type = ai_data.get('event_type', 'Unknown')
+                st.metric("Event Type", event_type if event_type else "Unknown")
+
+            with col2:
+                sentiment = ai_data.get('sentiment') or 'Neutral'
+                sentiment_icon = "🔴" if sentiment.lower() == 'negative' else "🟢" if sentiment.lower() == 'positive' else "🟡"
+                st.metric("Sentiment", f"{sentiment_icon} {sentiment}")
+
+            with col3:
+                ticker = ai_data.get('ticker', 'None')
+                st.metric("Detected Ticker", ticker if ticker else "None")
+
+            with col4:
+                sector = ai_data.get('sector', 'Unknown')
+                st.metric("Sector", sector if sector else "Unknown")
+
+            # AI Summary
+            if ai_data.get('summary'):
+                st.info(f"📝 **AI Summary:** {ai_data['summary']}")
+
+            st.markdown("---")
+
+        col1, col2, col3 = st.columns([2, 1, 1])
+
+        with col1:
+            risk_score = result.get('risk_score', 0)
+            st.plotly_chart(create_risk_gauge(risk_score), use_container_width=True, config=_PLOTLY_CONFIG)
+
+        with col2:
+            st.metric(
+                label="Risk Level",
+                value=result.get('risk_level', 'UNKNOWN'),
+                delta=f"{risk_score}/100"
+            )
+
+        with col3:
+            reasoning = result.get('reasoning', 'N/A')
+            st.metric(
+                label="Assessment",
+                value="Complete",
+                delta="AI Analysis"
+            )
+
+        # Reasoning section
+        with st.expander("📋 Detailed Reasoning", expanded=True):
+            st.write(reasoning)
+
+        # Recommendations
+        st.header("💡 Recommendations")
+        recommendations = result.get('recommendations', [])
+
+        if recommendations:
+            for rec in recommendations:
+                st.success(f"✅ {rec}")
+        else:
+            st.info("No specific recommendations available")
+
+        # Charts and Analytics Section
+        st.header("📈 Market Analytics")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Price Returns Chart
+            returns_chart = create_returns_chart(market_reaction)
+
+            if returns_chart:
+                st.subheader("📊 Price Returns Analysis")
+                st.plotly_chart(returns_chart, use_container_width=True, config=_PLOTLY_CONFIG)
+            else:
+                st.info("Price data not available for chart")
+
+        with col2:
+            # Risk Factors
+            sentiment_keywords = sentiment_analysis.get('sentiment_keywords_found', [])
+
+            st.subheader("📋 Key Metrics")
+
+            metric_col1, metric_col2 = st.columns(2)
+
+            with metric_col1:
+                st.metric("Similar Events", similar_count)
+                event_price = market_reaction.get('event_price')
+                if event_price:
+                    st.metric("Event Price", f"${event_price:.2f}")
+
+            with metric_col2:
+                vol_data = market_reaction.get('volatility_20_day', {})
+                if 'annualized_volatility' in vol_data:
+                    ann_vol = vol_data['annualized_volatility'] * 100
+                    st.metric("20-Day Volatility", f"{ann_vol:.1f}%")
+
+            if sentiment_keywords:
+                st.subheader("🔍 Sentiment Keywords")
+                keywords_text = ", ".join(sentiment_keywords[:5])  # Show first 5
+                st.info(keywords_text)
+
+        # Similar Events Section
+        st.header("🔍 Similar Historical Events")
+
+        if similar_count > 0:
+            st.info(f"Found {similar_count} similar historical events in the knowledge base")
+
+            # Display summary stats
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                negative_events = sentiment_analysis.get('negative_similar_events', 0)
+                st.metric("Negative Events", negative_events)
+
+            with col2:
+                high_impact = sentiment_analysis.get('high_impact_similar_events', 0)
+                st.metric("High Impact Events", high_impact)
+
+            with col3:
+                neutral_positive = similar_count - negative_events
+                st.metric("Other Events", neutral_positive)
+
+        else:
+            st.info("No similar historical events found in the knowledge base")
+
+        # Raw Data Section (Collapsible)
+        with st.expander("🔧 Raw Analysis Data", expanded=False):
+            # The expander's body runs even while collapsed, so only serialize on request
+            if st.toggle("Show raw data", key="show_raw_data"):
+                raw_json = _to_json(result)
+                st.code(raw_json, language="json")
+                st.download_button("⬇️ Download JSON", raw_json, file_name="risk_assessment.json",
+                                   mime="application/json")
+
+    else:
+        st.error(f"❌ Risk analysis failed: {result.get('error', 'Unknown error')}")
+        st.json(result)
 
 def main():
     """Main Streamlit application"""
@@ -164,6 +446,11 @@ def main():
     # Sidebar for inputs
     st.sidebar.header("🎯 Event Analysis Input")
 
+    # Without Ollama, events are only scored if the user accepts doing so without the AI event analysis
+    ollama_ready = _ollama_ready()
+    if not ollama_ready:
+        st.sidebar.warning("⚠️ Ollama is not reachable - events cannot get an AI event analysis. Start it with `ollama serve`.")
+
     # Event input form
     with st.sidebar.form("event_form"):
         st.subheader("Event Details")
@@ -186,182 +473,59 @@ def main():
             help="Date when the event occurred"
         )
 
+        score_without_ai = False
+        if not ollama_ready:
+            score_without_ai = st.checkbox(
+                "Score without AI event analysis",
+                help="Use keywords, similar events and price data only"
+            )
+
         submitted = st.form_submit_button("🔍 Analyze Risk", type="primary", use_container_width=True)
 
     # Main content area
-    if submitted and title and ticker:
-        with st.spinner("🔄 Analyzing event risk... This may take a few seconds."):
-
-            # Prepare event data
-            event_data = {
-                'title': title,
-                'ticker': ticker,
-                'date': event_date.strftime('%Y-%m-%d'),
-                'description': f"Analysis of {title} for {ticker}"
-            }
-
-            # Call risk scoring function
-            result = score_event_risk(event_data)
-
+    if submitted and title and ticker and not ollama_ready and not score_without_ai:
+        st.error("🤖 Ollama is not reachable. Start it with `ollama serve`, or tick 'Score without AI event analysis' to continue without it.")
+
+    elif submitted and title and ticker:
+        with st.status("🔄 Analyzing event risk... This may take a few seconds.", expanded=False) as status:
+
+            # Call risk scoring function; inputs this session already scored are
+            # answered from session state, other repeated inputs from the cache.
+            # The AI analysis, similar events and price reaction run concurrently inside it.
+            key = (title, ticker, event_date.strftime('%Y-%m-%d'))
+            result = _session_result(key)
+            if result is None:
+                result = score_form_event(*key)
+                if _is_complete(result):
+                    _remember_session_result(key, result)
+            st.session_state['last_result'] = result
+
+            # Per-stage outcome, read back from the assessment
             if result.get('status') == 'success':
-
-                # Risk Score Display
-                st.header("🎯 Risk Assessment Results")
-
-                # AI Event Analysis Section
-                if 'ai_event_analysis' in result.get('raw_metrics', {}) and result['raw_metrics']['ai_event_analysis']:
-                    st.subheader("🤖 AI Event Analysis (Mistral)")
-
-                    ai_data = result['raw_metrics']['ai_event_analysis']
-
-                    # AI Analysis Cards
-                    col1, col2, col3, col4 = st.columns(4)
-
-                    with col1:
-                        event_type = ai_data.get('event_type', 'Unknown')
-                        st.metric("Event Type", event_type if event_type else "Unknown")
-
-                    with col2:
-                        sentiment = ai_data.get('sentiment', 'Neutral')
-                        sentiment_icon = "🔴" if sentiment.lower() == 'negative' else "🟢" if sentiment.lower() == 'positive' else "🟡"
-                        st.metric("Sentiment", f"{sentiment_icon} {sentiment}")
-
-                    with col3:
-                        ticker = ai_data.get('ticker', 'None')
-                        st.metric("Detected Ticker", ticker if ticker else "None")
-
-                    with col4:
-                        sector = ai_data.get('sector', 'Unknown')
-                        st.metric("Sector", sector if sector else "Unknown")
-
-                    # AI Summary
-                    if ai_data.get('summary'):
-                        st.info(f"📝 **AI Summary:** {ai_data['summary']}")
-
-                    st.markdown("---")
-
-                col1, col2, col3 = st.columns([2, 1, 1])
-
-                with col1:
-                    risk_score = result.get('risk_score', 0)
-                    st.plotly_chart(create_risk_gauge(risk_score), use_container_width=True)
-
-                with col2:
-                    st.metric(
-                        label="Risk Level",
-                        value=result.get('risk_level', 'UNKNOWN'),
-                        delta=f"{risk_score}/100"
-                    )
-
-                with col3:
-                    reasoning = result.get('reasoning', 'N/A')
-                    st.metric(
-                        label="Assessment",
-                        value="Complete",
-                        delta="AI Analysis"
-                    )
-
-                # Reasoning section
-                with st.expander("📋 Detailed Reasoning", expanded=True):
-                    st.write(reasoning)
-
-                # Recommendations
-                st.header("💡 Recommendations")
-                recommendations = result.get('recommendations', [])
-
-                if recommendations:
-                    for rec in recommendations:
-                        st.success(f"✅ {rec}")
-                else:
-                    st.info("No specific recommendations available")
-
-                # Charts and Analytics Section
-                st.header("📈 Market Analytics")
-
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    # Price Returns Chart
-                    market_reaction = result.get('raw_metrics', {}).get('market_reaction', {})
-                    returns_chart = create_returns_chart(market_reaction)
-
-                    if returns_chart:
-                        st.subheader("📊 Price Returns Analysis")
-                        st.plotly_chart(returns_chart, use_container_width=True)
-                    else:
-                        st.info("Price data not available for chart")
-
-                with col2:
-                    # Risk Factors
-                    raw_metrics = result.get('raw_metrics', {})
-                    similar_count = raw_metrics.get('similar_events_count', 0)
-                    sentiment_keywords = raw_metrics.get('sentiment_impact_analysis', {}).get('sentiment_keywords_found', [])
-
-                    st.subheader("📋 Key Metrics")
-
-                    metric_col1, metric_col2 = st.columns(2)
-
-                    with metric_col1:
-                        st.metric("Similar Events", similar_count)
-                        event_price = market_reaction.get('event_price')
-                        if event_price:
-                            st.metric("Event Price", f"${event_price:.2f}")
-
-                    with metric_col2:
-                        vol_data = market_reaction.get('volatility_20_day', {})
-                        if 'annualized_volatility' in vol_data:
-                            ann_vol = vol_data['annualized_volatility'] * 100
-                            st.metric("20-Day Volatility", f"{ann_vol:.1f}%")
-
-                    if sentiment_keywords:
-                        st.subheader("🔍 Sentiment Keywords")
-                        keywords_text = ", ".join(sentiment_keywords[:5])  # Show first 5
-                        st.info(keywords_text)
-
-                # Similar Events Section
-                st.header("🔍 Similar Historical Events")
-                # Get similar events count from raw metrics
-                raw_metrics = result.get('raw_metrics', {})
-                similar_count = raw_metrics.get('similar_events_count', 0)
-
-                if similar_count > 0:
-                    st.info(f"Found {similar_count} similar historical events in the knowledge base")
-
-                    # Try to get more details from the risk assessment
-                    sentiment_analysis = raw_metrics.get('sentiment_impact_analysis', {})
-
-                    # Display summary stats
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        negative_events = sentiment_analysis.get('negative_similar_events', 0)
-                        st.metric("Negative Events", negative_events)
-
-                    with col2:
-                        high_impact = sentiment_analysis.get('high_impact_similar_events', 0)
-                        st.metric("High Impact Events", high_impact)
-
-                    with col3:
-                        neutral_positive = similar_count - negative_events
-                        st.metric("Other Events", neutral_positive)
-
-                else:
-                    st.info("No similar historical events found in the knowledge base")
-
-                # Raw Data Section (Collapsible)
-                with st.expander("🔧 Raw Analysis Data", expanded=False):
-                    st.json(result)
-
+                raw_metrics = result.get('raw_metrics') or {}
+                ai_data = raw_metrics.get('ai_event_analysis') or {}
+                market_reaction = raw_metrics.get('market_reaction') or {}
+                st.write(f"🤖 AI analysis: {'✓' if ai_data.get('sentiment') else 'unavailable'}")
+                st.write(f"🔍 Similar events: {raw_metrics.get('similar_events_count', 0)} found")
+                st.write(f"📈 Price data: {'unavailable' if not market_reaction or 'error' in market_reaction else '✓'}")
+                status.update(label="✅ Risk analysis complete", state="complete")
             else:
-                st.error(f"❌ Risk analysis failed: {result.get('error', 'Unknown error')}")
-                st.json(result)
+                status.update(label="❌ Risk analysis failed", state="error")
 
     elif submitted:
         st.warning("⚠️ Please fill in all required fields (Title and Ticker)")
 
+    # The latest assessment stays on screen across reruns until the next submission
+    if 'last_result' in st.session_state:
+        render_results(st.session_state['last_result'])
+
     # Footer
     st.markdown("---")
     st.markdown("*Market Sentinel - AI-Powered Market Risk Assessment*")
     st.markdown("*Built with Streamlit, Mistral LLM, Sentence Transformers, LanceDB, and DuckDB*")
 
+    # Load the scoring pipeline once the page is on screen, so the first analysis does not wait for it
+    _warm_up_pipeline()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
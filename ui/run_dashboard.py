@@ -19,7 +19,14 @@ def main():
 
         # Launch Streamlit
         cmd = [sys.executable, '-m', 'streamlit', 'run', dashboard_path]
-        subprocess.run(cmd, cwd=os.path.dirname(script_dir))
+        if os.name == 'nt':
+            # No exec on Windows: os.execv starts a new process and returns control to the shell
+            subprocess.run(cmd, cwd=os.path.dirname(script_dir))
+        else:
+            # Replace this process with Streamlit rather than waiting on it as a child
+            os.chdir(os.path.dirname(script_dir))
+            sys.stdout.flush()
+            os.execv(sys.executable, cmd)
 
     except KeyboardInterrupt:
         print("\n👋 Dashboard stopped by user")
@@ -0,0 +1,75 @@
+# Analysis Cache Module for Market Sentinel
+"""
+Persistent cache of headline analyses backed by SQLite.
+
+Analyses are keyed by a hash of the model name and the exact headline, so a
+headline only goes through the LLM once per model, across processes.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = "./analysis_cache.sqlite3"
+
+def analysis_key(model_name: str, headline: str) -> bytes:
+    """
+    Cache key for a headline analyzed with a given model.
+
+    Args:
+        model_name (str): Name of the LLM
+        headline (str): Headline that was analyzed
+
+    Returns:
+        bytes: 32-byte BLAKE2b digest of model_name + NUL + headline
+    """
+    return hashlib.blake2b(f"{model_name}\0{headline}".encode("utf-8"), digest_size=32).digest()
+
+class AnalysisCache:
+    """
+    SQLite table of (hash, analysis) pairs with analyses stored as JSON.
+
+    A single connection is shared between threads behind a lock.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses (hash BLOB PRIMARY KEY, analysis TEXT NOT NULL)"
+            )
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached analysis.
+
+        Args:
+            key (bytes): Key from analysis_key
+
+        Returns:
+            Optional[Dict[str, Any]]: The analysis, or None if it is not cached
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT analysis FROM analyses WHERE hash = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: bytes, analysis: Dict[str, Any]) -> None:
+        """
+        Store an analysis, replacing any existing entry for the same key.
+
+        Args:
+            key (bytes): Key from analysis_key
+            analysis (Dict[str, Any]): JSON-serializable analysis
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (hash, analysis) VALUES (?, ?)", (key, json.dumps(analysis))
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
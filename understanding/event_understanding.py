@@ -1,16 +1,96 @@
 # Event Understanding Module for Market Sentinel
 
+import atexit
+import collections
+import copy
+import functools
+import json
+import sqlite3
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
 
-def analyze_event(headline):
+from understanding._analysis_cache import AnalysisCache, analysis_key
+
+# orjson parses the streamed chunks faster when installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Ollama model used for headline analysis
+MODEL_NAME = "mistral"
+
+# Headlines sent to the model per analyze_events prompt
+_BATCH_SIZE = 10
+
+# Parsed analyses kept in process, in front of the on-disk analysis cache
+_MEMO_SIZE = 1024
+
+# Kept-alive connections to Ollama; enough for the risk engine's concurrent analyses
+_POOL_SIZE = 8
+
+@functools.lru_cache(maxsize=1)
+def _get_session():
     """
-    Analyzes a market news headline using Ollama (Mistral model) to extract event details.
+    HTTP session shared by all analyze_event calls, created on first use.
+
+    Requests reuse pooled keep-alive connections instead of opening a new one
+    each time; the session is closed at interpreter exit.
+    """
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE))
+    atexit.register(session.close)
+    return session
+
+def _read_streamed_response(response):
+    """
+    Accumulate the text of a streamed Ollama response.
+
+    Stops reading as soon as the text holds a complete JSON object, so the
+    model does not have to finish generating whatever follows it.
 
     Args:
-        headline (str): The market news headline to analyze.
+        response (requests.Response): Streaming response of /api/generate
 
     Returns:
-        dict: Dictionary with keys: event_type, sentiment, ticker, sector, summary.
+        tuple: (text so far, parsed JSON object or None if none was complete)
+    """
+    content = ""
+    start = -1
+    for line in response.iter_lines():
+        if not line:
+            continue
+        chunk = _json_loads(line)
+        piece = chunk.get("response", "")
+        content += piece
+        if start < 0:
+            start = content.find('{')
+        if start >= 0 and '}' in piece:
+            try:
+                return content, _json_loads(content[start:content.rfind('}') + 1])
+            except ValueError:
+                pass
+        if chunk.get("done"):
+            break
+    return content, None
+
+def _error_analysis(e):
+    return {
+        "event_type": None,
+        "sentiment": None,
+        "ticker": None,
+        "sector": None,
+        "summary": f"Error analyzing event: {e}"
+    }
+
+def _request_analysis(model_name, headline):
+    """
+    One /api/generate call for a headline.
+
+    Returns:
+        tuple: (analysis dict, whether it was parsed from the model's JSON)
     """
     prompt = f"""
 Given the following market news headline, extract:
@@ -27,40 +107,191 @@ Headline:
 """
     url = "http://localhost:11434/api/generate"
     data = {
-        "model": "mistral",
+        "model": model_name,
         "prompt": prompt,
-        "stream": False
+        "stream": True
     }
     try:
-        response = requests.post(url, json=data, timeout=30)
-        response.raise_for_status()
-        model_response = response.json()
+        # Ollama streams one {'response': <text chunk>, 'done': <bool>} object per line
+        with _get_session().post(url, json=data, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            content, result = _read_streamed_response(response)
+        if result is not None:
+            return result, True
 
-        # Ollama returns {'response': <string>} for non-streaming mode
-        import json
-        content = model_response.get("response", "")
         # Try to find JSON object in response
         try:
             # Sometimes the model's response might have text before JSON
             start = content.find('{')
             end = content.rfind('}') + 1
             json_content = content[start:end]
-            result = json.loads(json_content)
+            return _json_loads(json_content), True
         except Exception:
             # fallback: return as much as we can
-            result = {
+            return {
                 "event_type": None,
                 "sentiment": None,
                 "ticker": None,
                 "sector": None,
                 "summary": content.strip()
-            }
-        return result
+            }, False
+    except Exception as e:
+        return _error_analysis(e), False
+
+# analysis_key -> parsed analysis, least recently used first
+_memo = collections.OrderedDict()
+_memo_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _get_analysis_cache():
+    """Open the on-disk analysis cache once; None if it cannot be opened (e.g. read-only directory)."""
+    try:
+        return AnalysisCache()
+    except sqlite3.Error:
+        return None
+
+def _remember(key, analysis):
+    with _memo_lock:
+        _memo[key] = analysis
+        _memo.move_to_end(key)
+        if len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+
+def _lookup_analysis(model_name, headline):
+    """Parsed analysis of a headline from the in-process memo, then the on-disk cache; None on a miss."""
+    key = analysis_key(model_name, headline)
+    with _memo_lock:
+        analysis = _memo.get(key)
+        if analysis is not None:
+            _memo.move_to_end(key)
+            return analysis
+
+    cache = _get_analysis_cache()
+    analysis = cache.get(key) if cache is not None else None
+    if analysis is not None:
+        _remember(key, analysis)
+    return analysis
+
+def _store_analysis(model_name, headline, analysis):
+    """Keep a parsed analysis in the in-process memo and the on-disk cache."""
+    key = analysis_key(model_name, headline)
+    _remember(key, analysis)
+    cache = _get_analysis_cache()
+    if cache is not None:
+        cache.put(key, analysis)
+
+def warm_up():
+    """
+    Open the on-disk analysis cache ahead of the first analysis.
+
+    Returns:
+        dict: Whether the analysis cache could be opened
+    """
+    return {'analysis_cache': _get_analysis_cache() is not None}
+
+def analyze_event(headline):
+    """
+    Analyzes a market news headline using Ollama (Mistral model) to extract event details.
+
+    The analysis depends only on the model and the headline, so analyses
+    parsed from the model's JSON are kept per (MODEL_NAME, headline), in
+    memory and in the on-disk analysis cache, and repeated headlines skip
+    the LLM call. Fallback and error analyses are never kept.
+
+    Args:
+        headline (str): The market news headline to analyze.
+
+    Returns:
+        dict: Dictionary with keys: event_type, sentiment, ticker, sector, summary.
+            A new copy on every call, so callers may modify it.
+    """
+    analysis = _lookup_analysis(MODEL_NAME, headline)
+    if analysis is None:
+        analysis, parsed = _request_analysis(MODEL_NAME, headline)
+        if not parsed:
+            return analysis
+        _store_analysis(MODEL_NAME, headline, analysis)
+    return copy.deepcopy(analysis)
+
+def _analyze_chunk(model_name, headlines):
+    """
+    One /api/generate call for a list of headlines, asking for a JSON array.
+
+    Returns:
+        list: One (analysis, parsed) pair per headline. parsed is True for an
+            object taken from the model's array; (None, False) means the array
+            was unusable for that headline (missing, wrong length, or not an
+            object) and it needs analyzing on its own; a failed request gives
+            an error analysis with parsed False for every headline.
+    """
+    numbered = "\n".join(f"{i}. \"\"\"{headline}\"\"\"" for i, headline in enumerate(headlines, 1))
+    prompt = f"""
+For each of the following {len(headlines)} market news headlines, extract:
+- event_type (e.g., 'Rate Decision', 'Earnings Report', 'M&A', etc.)
+- sentiment (Positive, Negative, Neutral)
+- ticker (if mentioned, else null or empty string)
+- sector (if mentioned, else null or empty string)
+- summary (a 1-2 sentence summary of the event in plain English)
+
+Respond with a valid JSON array of exactly {len(headlines)} objects, one per headline in the same order,
+each using keys: event_type, sentiment, ticker, sector, summary.
+
+Headlines:
+{numbered}
+"""
+    url = "http://localhost:11434/api/generate"
+    data = {
+        "model": model_name,
+        "prompt": prompt,
+        "stream": False
+    }
+    try:
+        response = _get_session().post(url, json=data, timeout=30 + 10 * len(headlines))
+        response.raise_for_status()
+        content = _json_loads(response.content).get("response", "")
     except Exception as e:
-        return {
-            "event_type": None,
-            "sentiment": None,
-            "ticker": None,
-            "sector": None,
-            "summary": f"Error analyzing event: {e}"
-        }
\ No newline at end of file
+        return [(_error_analysis(e), False) for _ in headlines]
+
+    unusable = [(None, False)] * len(headlines)
+    try:
+        items = _json_loads(content[content.find('['):content.rfind(']') + 1])
+    except ValueError:
+        return unusable
+    if not isinstance(items, list) or len(items) != len(headlines):
+        return unusable
+    return [(item, True) if isinstance(item, dict) else (None, False) for item in items]
+
+def analyze_events(headlines):
+    """
+    Analyzes several market news headlines with one Ollama call per batch.
+
+    Headlines already analyzed are answered from the in-process memo and the
+    on-disk analysis cache, as in analyze_event. The distinct remaining ones
+    are sent _BATCH_SIZE at a time in a single prompt asking for a JSON
+    array, and the objects taken from it are stored in both. Any headline
+    the model's array does not account for is analyzed on its own with
+    analyze_event.
+
+    Args:
+        headlines (list): Market news headlines to analyze.
+
+    Returns:
+        list: One analysis dict per headline, in input order, with the same
+            keys as analyze_event.
+    """
+    headlines = list(headlines)
+    analyses = [_lookup_analysis(MODEL_NAME, headline) for headline in headlines]
+    misses = list(dict.fromkeys(headline for headline, analysis in zip(headlines, analyses) if analysis is None))
+
+    fresh = {}
+    for i in range(0, len(misses), _BATCH_SIZE):
+        chunk = misses[i:i + _BATCH_SIZE]
+        for headline, (analysis, parsed) in zip(chunk, _analyze_chunk(MODEL_NAME, chunk)):
+            if parsed:
+                _store_analysis(MODEL_NAME, headline, analysis)
+            elif analysis is None:
+                analysis = analyze_event(headline)
+            fresh[headline] = analysis
+
+    return [copy.deepcopy(analysis if analysis is not None else fresh[headline])
+            for headline, analysis in zip(headlines, analyses)]
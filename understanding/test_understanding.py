@@ -4,11 +4,74 @@ Test script for event understanding functionality using actual Ollama.
 
 import sys
 import os
+import json
+import tempfile
 
 # Add parent directory to path to allow importing from sibling modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from understanding.event_understanding import analyze_event
+from understanding import event_understanding
+from understanding.event_understanding import analyze_event, analyze_events
+from understanding._analysis_cache import AnalysisCache, analysis_key
+
+class _FakeResponse:
+    """Stands in for a requests.Response of /api/generate."""
+
+    def __init__(self, lines=(), content=b""):
+        self._lines = lines
+        self.content = content
+        self.lines_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        for line in self._lines:
+            self.lines_read += 1
+            yield line
+
+class _FakeSession:
+    """Stands in for the shared requests.Session, answering every post with respond(json payload)."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = 0
+
+    def post(self, url, json=None, **kwargs):
+        self.calls += 1
+        return self.respond(json)
+
+def _streamed(*pieces):
+    """Streamed /api/generate lines carrying the given text pieces, the last one marked done."""
+    return [json.dumps({"response": piece, "done": i == len(pieces) - 1}).encode()
+            for i, piece in enumerate(pieces)]
+
+class _patched_ollama:
+    """Route event_understanding through a fake session and a temporary analysis cache."""
+
+    def __init__(self, session, cache_path):
+        self.session = session
+        self.cache_path = cache_path
+
+    def __enter__(self):
+        self._saved = (event_understanding._get_session, event_understanding._get_analysis_cache)
+        self.cache = AnalysisCache(self.cache_path)
+        event_understanding._get_session = lambda: self.session
+        event_understanding._get_analysis_cache = lambda: self.cache
+        event_understanding._memo.clear()
+        return self
+
+    def __exit__(self, *exc_info):
+        event_understanding._get_session, event_understanding._get_analysis_cache = self._saved
+        event_understanding._memo.clear()
+        self.cache.close()
+        return False
 
 def test_analyze_event():
     """
@@ -73,5 +136,214 @@ def test_analyze_event():
         print("- Try restarting Ollama: ollama serve")
         print("- Check Ollama logs for errors")
 
+def test_read_streamed_response():
+    """
+    Test _read_streamed_response on streamed chunks: JSON then chatter, no JSON and broken JSON.
+    """
+    print("\nTesting _read_streamed_response function...")
+    print("=" * 50)
+
+    analysis = _analysis_for("Apple beats earnings")
+    text = json.dumps(analysis)
+    chatter = _streamed("Sure! ", text[:20], text[20:], " Let me know", " if you need more.")
+    responses = {
+        "json then chatter": _FakeResponse(chatter[:2] + [b""] + chatter[2:]),
+        "no json": _FakeResponse(_streamed("I cannot ", "analyze that.")),
+        "broken json": _FakeResponse(_streamed('{"sentiment": ', '"Positive",}', " sorry")),
+    }
+
+    results = {case: event_understanding._read_streamed_response(response)
+               for case, response in responses.items()}
+    for case, (content, parsed) in results.items():
+        print(f"{case}: read {responses[case].lines_read} lines, parsed {parsed}")
+
+    expected = {
+        "json then chatter": ("Sure! " + text, analysis),
+        "no json": ("I cannot analyze that.", None),
+        "broken json": ('{"sentiment": "Positive",} sorry', None),
+    }
+    if results != expected:
+        print("ERROR: Streamed responses were not read as expected")
+        return False
+    if responses["json then chatter"].lines_read != 4:
+        print("ERROR: Reading did not stop at the end of the JSON object")
+        return False
+
+    print("\nSUCCESS: _read_streamed_response read every stream as expected!")
+    return True
+
+def _analysis_for(headline):
+    return {"event_type": "News", "sentiment": "Neutral", "ticker": "", "sector": "", "summary": headline}
+
+def _batch_headlines(prompt):
+    """The numbered headlines of an analyze_events prompt, in order."""
+    return [line.split('"""')[1] for line in prompt.splitlines() if line[:1].isdigit() and '"""' in line]
+
+def test_analyze_chunk():
+    """
+    Test how _analyze_chunk reads the model's array: good, wrong-length and non-object answers.
+    """
+    print("\nTesting _analyze_chunk function...")
+    print("=" * 50)
+
+    headlines = ["Apple beats earnings", "Fed holds rates", "Tesla recalls cars"]
+    good = [_analysis_for(headline) for headline in headlines]
+    answers = {
+        "good": "Here you go: " + json.dumps(good) + " Hope this helps.",
+        "wrong length": json.dumps(good[:2]),
+        "non-object": json.dumps([good[0], "Fed holds rates", good[2]]),
+        "no array": "I cannot answer that.",
+    }
+
+    results = {}
+    for case, text in answers.items():
+        session = _FakeSession(lambda payload, text=text: _FakeResponse(content=json.dumps({"response": text}).encode()))
+        with tempfile.TemporaryDirectory() as tmp_dir, _patched_ollama(session, os.path.join(tmp_dir, "cache.sqlite3")):
+            results[case] = event_understanding._analyze_chunk(event_understanding.MODEL_NAME, headlines)
+        print(f"{case}: {[parsed for _, parsed in results[case]]}")
+
+    expected = {
+        "good": [(analysis, True) for analysis in good],
+        "wrong length": [(None, False)] * 3,
+        "non-object": [(good[0], True), (None, False), (good[2], True)],
+        "no array": [(None, False)] * 3,
+    }
+    if results != expected:
+        print("ERROR: Model arrays were not read as expected")
+        return False
+
+    print("\nSUCCESS: _analyze_chunk read every answer as expected!")
+    return True
+
+def test_analyze_events():
+    """
+    Test that analyze_events batches cache misses, stores what it parsed and falls back per headline.
+    """
+    print("\nTesting analyze_events function...")
+    print("=" * 50)
+
+    headlines = ["Apple beats earnings", "Fed holds rates", "Tesla recalls cars", "Apple beats earnings"]
+
+    def respond(payload):
+        if payload["stream"]:
+            # Single-headline fallback
+            headline = payload["prompt"].split('"""')[1]
+            return _FakeResponse(_streamed(json.dumps(_analysis_for(headline))))
+        batch = _batch_headlines(payload["prompt"])
+        # The model drops the answer for the Fed headline
+        items = [_analysis_for(headline) if headline != "Fed holds rates" else "no idea" for headline in batch]
+        return _FakeResponse(content=json.dumps({"response": json.dumps(items)}).encode())
+
+    session = _FakeSession(respond)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with _patched_ollama(session, os.path.join(tmp_dir, "cache.sqlite3")):
+            first = analyze_events(headlines)
+            first_calls = session.calls
+            again = analyze_events(reversed(headlines))
+            again_calls = session.calls - first_calls
+
+    print(f"LLM calls: first run {first_calls}, second run {again_calls}")
+    if first != [_analysis_for(headline) for headline in headlines]:
+        print(f"ERROR: Unexpected analyses: {first}")
+        return False
+    # One batch request for the three distinct headlines, one single request for the dropped one
+    if first_calls != 2 or again_calls != 0 or again != first[::-1]:
+        print("ERROR: Batch analyses were not reused from the caches")
+        return False
+
+    print("\nSUCCESS: analyze_events batched, cached and fell back as expected!")
+    return True
+
+def test_analysis_memo():
+    """
+    Test that parsed analyses are reused, in process and from disk, and fallbacks are not kept.
+    """
+    print("\nTesting analysis memoization...")
+    print("=" * 50)
+
+    analysis = {"event_type": "Investigation", "sentiment": "Negative", "ticker": "TSLA",
+                "sector": None, "summary": "Tesla is under SEC investigation."}
+
+    def respond(payload):
+        if "SEC" in payload["prompt"]:
+            return _FakeResponse(_streamed(json.dumps(analysis)))
+        return _FakeResponse(_streamed("Sorry, I cannot help with that."))
+
+    session = _FakeSession(respond)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "cache.sqlite3")
+        with _patched_ollama(session, cache_path) as patched:
+            first = analyze_event("Tesla faces SEC investigation")
+            first["sentiment"] = "mutated"
+            second = analyze_event("Tesla faces SEC investigation")
+            parsed_calls = session.calls
+
+            # Not parsed from JSON: asked again every time, never stored
+            analyze_event("Unparseable headline")
+            fallback = analyze_event("Unparseable headline")
+            fallback_calls = session.calls - parsed_calls
+            stored_fallback = patched.cache.get(
+                event_understanding.analysis_key(event_understanding.MODEL_NAME, "Unparseable headline"))
+
+        # A fresh process: empty memo, same on-disk cache
+        with _patched_ollama(_FakeSession(respond), cache_path) as patched:
+            from_disk = analyze_event("Tesla faces SEC investigation")
+            disk_calls = patched.session.calls
+
+    print(f"LLM calls: parsed {parsed_calls}, fallback {fallback_calls}, after restart {disk_calls}")
+    if second != analysis or parsed_calls != 1:
+        print("ERROR: Parsed analysis was not reused unchanged")
+        return False
+    if fallback_calls != 2 or stored_fallback is not None or fallback["sentiment"] is not None:
+        print("ERROR: Fallback analysis was memoized")
+        return False
+    if from_disk != analysis or disk_calls != 0:
+        print("ERROR: Parsed analysis was not reused from the on-disk cache")
+        return False
+
+    print("\nSUCCESS: Analysis memoization behaved as expected!")
+    return True
+
+def test_analysis_cache():
+    """
+    Test that cached analyses round-trip and are keyed by model and headline.
+    """
+    print("\nTesting analysis cache...")
+    print("=" * 50)
+
+    analysis = {"event_type": "Investigation", "sentiment": "Negative", "ticker": "TSLA",
+                "sector": None, "summary": "Tesla is under SEC investigation."}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "cache.sqlite3")
+        cache = AnalysisCache(path)
+        try:
+            cache.put(analysis_key("mistral", "Tesla faces SEC investigation"), analysis)
+        finally:
+            cache.close()
+
+        # A new connection sees what the previous one stored
+        cache = AnalysisCache(path)
+        try:
+            cached = cache.get(analysis_key("mistral", "Tesla faces SEC investigation"))
+            other_model = cache.get(analysis_key("llama3", "Tesla faces SEC investigation"))
+            other_headline = cache.get(analysis_key("mistral", "Tesla faces SEC probe"))
+        finally:
+            cache.close()
+
+    print(f"Cached: {cached}")
+    print(f"Other model: {other_model}, other headline: {other_headline}")
+    if cached != analysis or other_model is not None or other_headline is not None:
+        print("ERROR: Analysis cache returned unexpected entries")
+        return False
+
+    print("\nSUCCESS: Analysis cache behaved as expected!")
+    return True
+
 if __name__ == "__main__":
-    test_analyze_event()
\ No newline at end of file
+    test_analyze_event()
+    test_read_streamed_response()
+    test_analyze_chunk()
+    test_analyze_events()
+    test_analysis_memo()
+    test_analysis_cache()
\ No newline at end of file
@@ -0,0 +1,23 @@
+# JIT compilation helpers for Market Sentinel
+"""
+Optional Numba support.
+
+Kernels decorated with njit are compiled when numba is installed and run as
+plain Python otherwise, so numba stays an optional dependency.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit supporting both @njit and @njit(...)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator